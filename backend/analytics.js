@@ -0,0 +1,55 @@
+const { OccupancyRollup, Seat } = require('./models');
+const { bucketStart, PERIODS } = require('./occupancyHistory');
+
+function summarize(rows) {
+  let observed = 0;
+  let occupied = 0;
+  let span = 0;
+  let peak = 0;
+  for (const row of rows) {
+    observed += row.observed_ms;
+    occupied += row.occupied_ms;
+    span += row.span_ms;
+    peak = Math.max(peak, row.peak);
+  }
+  if (observed === 0) return null;
+  return {
+    utilization: occupied / observed,
+    meanOccupancy: span ? occupied / span : 0,
+    peak
+  };
+}
+
+// Last 7 days (including today) against the 7 before, from daily rollups.
+// Reads at most 14 documents however much history exists.
+async function weekOverWeek(level, key, now = Date.now()) {
+  const today = bucketStart(now, 'day').getTime();
+  const weekStart = today - 6 * PERIODS.day;
+  const rows = await OccupancyRollup.find(
+    { level, key, period: 'day', start: { $gte: new Date(weekStart - 7 * PERIODS.day) } },
+    { start: 1, observed_ms: 1, occupied_ms: 1, span_ms: 1, peak: 1, _id: 0 }
+  ).lean();
+  return {
+    current: summarize(rows.filter(row => row.start.getTime() >= weekStart)),
+    previous: summarize(rows.filter(row => row.start.getTime() < weekStart))
+  };
+}
+
+// Rooms on a floor ordered from least to most used over the last 7 days
+async function quietestRooms(building, floor, limit = 3, now = Date.now()) {
+  const since = new Date(bucketStart(now, 'day').getTime() - 6 * PERIODS.day);
+  const rows = await OccupancyRollup.aggregate([
+    { $match: { level: 'room', building, floor, period: 'day', start: { $gte: since } } },
+    { $group: { _id: '$key', occupied_ms: { $sum: '$occupied_ms' }, observed_ms: { $sum: '$observed_ms' } } },
+    { $match: { observed_ms: { $gt: 0 } } },
+    { $project: { _id: 0, room_id: '$_id', utilization: { $divide: ['$occupied_ms', '$observed_ms'] } } },
+    { $sort: { utilization: 1, room_id: 1 } },
+    { $limit: limit },
+    // Accessibility lives on the seat, not the rollup; one indexed lookup per row
+    { $lookup: { from: Seat.collection.name, localField: 'room_id', foreignField: 'room_id', as: 'seat' } },
+    { $project: { room_id: 1, utilization: 1, accessible: { $eq: [{ $arrayElemAt: ['$seat.accessible', 0] }, true] } } }
+  ]);
+  return rows;
+}
+
+module.exports = { weekOverWeek, quietestRooms };
@@ -0,0 +1,175 @@
+const express = require('express');
+const cors = require('cors');
+const { Seat, Building } = require('./models');
+const { SeatStream } = require('./seatStream');
+const { normalizeReading } = require('./readingBuffer');
+const { weekOverWeek, quietestRooms } = require('./analytics');
+const { findSeats, QueryError } = require('./seatQuery');
+const { httpMetrics } = require('./metrics');
+
+// Accepts a JSON array, `{ readings: [...] }`, a single reading, or NDJSON.
+function readingsFromBody(body) {
+  if (typeof body === 'string') {
+    return body.split('\n').filter(line => line.trim() !== '').map(line => {
+      try {
+        return JSON.parse(line);
+      } catch (err) {
+        return null;
+      }
+    });
+  }
+  if (Array.isArray(body)) return body;
+  if (body && Array.isArray(body.readings)) return body.readings;
+  return [body];
+}
+
+// `snapshot` is optional: without one (or before it has loaded) every request
+// goes straight to Mongo and there is no live stream. `readings` is the
+// ReadingBuffer behind POST /api/readings. `metrics` is a metrics Registry;
+// when given, every route is timed and the registry is served on /metrics.
+// `ready` reports whether this process should receive traffic (GET /ready).
+function createApp({ snapshot = null, readings = null, metrics = null, ready = () => true } = {}) {
+  const app = express();
+  if (metrics) app.use(httpMetrics(metrics));
+  app.use(cors());
+
+  // For load balancers: 503 until Mongo is connected and the snapshot is
+  // loaded, and again once the process starts draining
+  app.get('/ready', (req, res) => {
+    if (!ready()) return res.status(503).json({ message: "Not ready" });
+    res.json({ ready: true });
+  });
+
+  if (readings) {
+    // Registered ahead of the default 100kb JSON parser so batches can be larger
+    app.post('/api/readings',
+      express.json({ limit: '5mb' }),
+      express.text({ type: ['application/x-ndjson', 'application/jsonl'], limit: '5mb' }),
+      (req, res) => {
+        // Any other type is left unparsed, which would read as one bad reading
+        if (!req.is(['application/json', 'application/x-ndjson', 'application/jsonl'])) {
+          return res.status(415).json({ message: "Send readings as application/json or application/x-ndjson" });
+        }
+        if (readings.full) {
+          res.set('Retry-After', '1');
+          return res.status(503).json({ message: "Ingestion queue full" });
+        }
+        const valid = [];
+        let rejected = 0;
+        for (const raw of readingsFromBody(req.body)) {
+          const reading = normalizeReading(raw);
+          if (reading) valid.push(reading);
+          else rejected += 1;
+        }
+        // All or nothing, so a client retrying after a 503 resends everything
+        if (!readings.addAll(valid)) {
+          res.set('Retry-After', '1');
+          return res.status(503).json({ message: "Ingestion queue full" });
+        }
+        res.status(202).json({ accepted: valid.length, rejected });
+      });
+  }
+
+  app.use(express.json());
+
+  const stream = snapshot ? new SeatStream(snapshot) : null;
+
+  app.get('/api/seats', async (req, res) => {
+    if (snapshot && snapshot.ready) {
+      res.set('Cache-Control', 'no-cache');
+      res.set('ETag', snapshot.etag);
+      if (req.fresh) return res.status(304).end();
+      return res.type('json').send(snapshot.body);
+    }
+    try {
+      const seats = await Seat.find();
+      res.json(seats);
+    } catch (error) {
+      res.status(500).json({ message: "Error fetching seats" });
+    }
+  });
+
+  // Filtered, paginated seats. `streamId` can be passed to
+  // /api/seats/stream?since= to receive only changes from here on.
+  app.get('/api/seats/query', async (req, res) => {
+    // Taken before the query so no change can fall between the two
+    const streamId = stream ? stream.currentId() : undefined;
+    try {
+      const page = await findSeats(req.query);
+      res.json({ ...page, streamId });
+    } catch (error) {
+      if (error instanceof QueryError) return res.status(400).json({ message: error.message });
+      res.status(500).json({ message: "Error querying seats" });
+    }
+  });
+
+  // Layout and live available/total counts for every building and floor.
+  // Express's ETag lets clients poll this with If-None-Match.
+  app.get('/api/buildings', async (req, res) => {
+    try {
+      res.json(await Building.find({}, { _id: 0 }).sort({ name: 1 }).lean());
+    } catch (error) {
+      res.status(500).json({ message: "Error fetching buildings" });
+    }
+  });
+
+  // Week-over-week metrics for a building and one of its floors
+  app.get('/api/analytics', async (req, res) => {
+    const { building, floor } = req.query;
+    if (!building) return res.status(400).json({ message: "building is required" });
+    try {
+      const [buildingStats, floorStats] = await Promise.all([
+        weekOverWeek('building', building),
+        floor === undefined ? null : weekOverWeek('floor', `${building}|${floor}`)
+      ]);
+      res.json({ building: buildingStats, floor: floorStats });
+    } catch (error) {
+      res.status(500).json({ message: "Error fetching analytics" });
+    }
+  });
+
+  app.get('/api/analytics/rooms', async (req, res) => {
+    const { building } = req.query;
+    const floor = Number(req.query.floor);
+    const limit = Math.min(Number(req.query.limit) || 3, 50);
+    if (!building || !Number.isFinite(floor)) {
+      return res.status(400).json({ message: "building and floor are required" });
+    }
+    try {
+      res.json(await quietestRooms(building, floor, limit));
+    } catch (error) {
+      res.status(500).json({ message: "Error fetching room history" });
+    }
+  });
+
+  if (stream) {
+    app.get('/api/seats/stream', (req, res) => stream.handle(req, res));
+    app.locals.seatStream = stream;
+  }
+
+  if (metrics) {
+    metrics.gauge('seat_stream_clients', 'Connected /api/seats/stream clients', [], gauge => {
+      gauge.set([], stream ? stream.clients.size : 0);
+    });
+    metrics.gauge('seat_snapshot_version', 'Seat snapshot version served from memory', [], gauge => {
+      gauge.set([], snapshot && snapshot.ready ? snapshot.version : 0);
+    });
+    if (readings) {
+      metrics.gauge('readings_pending', 'Rooms with readings waiting to be flushed', [], gauge => {
+        gauge.set([], readings.pending.size);
+      });
+      metrics.counter('readings_total', 'Sensor readings by outcome', ['outcome'], counter => {
+        for (const outcome of ['received', 'coalesced', 'written', 'stale', 'failed']) {
+          counter.set([outcome], readings.stats[outcome]);
+        }
+      });
+    }
+    app.get('/metrics', (req, res) => {
+      res.type('text/plain; version=0.0.4').send(metrics.render());
+    });
+  }
+
+  return app;
+}
+
+module.exports = { createApp };
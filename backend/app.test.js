@@ -0,0 +1,76 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { EventEmitter } = require('events');
+const { createApp } = require('./app');
+const { ReadingBuffer } = require('./readingBuffer');
+const { Registry } = require('./metrics');
+
+// Serves createApp() on a free port with a fake snapshot and Mongo-less readings
+async function serve(t) {
+  const snapshot = Object.assign(new EventEmitter(), { ready: true, version: 1, position: null, updatedAt: 0, body: '[]' });
+  const readings = new ReadingBuffer({ bulkWrite: async () => {} });
+  const metrics = new Registry();
+  const app = createApp({ snapshot, readings, metrics });
+  const server = await new Promise(resolve => {
+    const s = app.listen(0, '127.0.0.1', () => resolve(s));
+  });
+  t.after(() => {
+    app.locals.seatStream.close();
+    server.closeAllConnections();
+    server.close();
+  });
+  const base = `http://127.0.0.1:${server.address().port}`;
+  const metric = async pattern => (await (await fetch(`${base}/metrics`)).text()).match(pattern);
+  return { base, readings, metric };
+}
+
+test('a route whose body parser fails is labelled with its route', async t => {
+  const { base, metric } = await serve(t);
+  t.mock.method(console, 'error', () => {});
+
+  const response = await fetch(`${base}/api/readings`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: '{"room_id":'
+  });
+
+  assert.equal(response.status, 400);
+  assert.ok(await metric(/http_request_duration_seconds_count\{method="POST",route="\/api\/readings",status="400"\} 1/));
+});
+
+test('open event streams are not counted as requests in flight', async t => {
+  const { base, metric } = await serve(t);
+  const controller = new AbortController();
+  t.after(() => controller.abort());
+
+  const stream = await fetch(`${base}/api/seats/stream`, { headers: { Accept: 'text/event-stream' }, signal: controller.signal });
+
+  assert.equal(stream.headers.get('content-type'), 'text/event-stream');
+  // Only the /metrics request itself
+  assert.ok(await metric(/^http_requests_in_flight 1$/m));
+});
+
+test('readings with an unsupported content type are refused', async t => {
+  const { base, readings } = await serve(t);
+
+  const response = await fetch(`${base}/api/readings`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'text/plain' },
+    body: '{"room_id":"A-101","occupied":1}'
+  });
+
+  assert.equal(response.status, 415);
+  assert.equal(readings.stats.received, 0);
+});
+
+test('readings are accepted as JSON or NDJSON', async t => {
+  const { base, readings } = await serve(t);
+  const post = (type, body) => fetch(`${base}/api/readings`, { method: 'POST', headers: { 'Content-Type': type }, body });
+
+  const json = await post('application/json', '[{"room_id":"A-101","occupied":1},{"room_id":"A-102"}]');
+  const ndjson = await post('application/x-ndjson', '{"room_id":"A-103","occupied":0}\n{"room_id":"A-104","occupied":1}\n');
+
+  assert.deepEqual([json.status, await json.json()], [202, { accepted: 1, rejected: 1 }]);
+  assert.deepEqual([ndjson.status, await ndjson.json()], [202, { accepted: 2, rejected: 0 }]);
+  assert.deepEqual([...readings.pending.keys()], ['A-101', 'A-103', 'A-104']);
+});
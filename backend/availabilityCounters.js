@@ -0,0 +1,159 @@
+const { Building } = require('./models');
+
+function isAvailable(doc) {
+  return doc.occupied === 0 ? 1 : 0;
+}
+
+// Keeps Building.available/total and each floor's counts in step with a
+// SeatSnapshot. Every changed seat is an O(1) adjustment to its floor; each
+// snapshot change becomes one bulkWrite of $inc, one op per touched floor.
+// `reconcile()` recounts the rooms the increments are based on and overwrites
+// the counters. It runs on the first snapshot (repairing changes made while
+// no process was maintaining the counters) and every `reconcileMs` (repairing
+// increments that failed to write). Counting from the same state as the
+// increments, rather than re-reading OccupancyInfo, means a change is never
+// both recounted and incremented.
+//
+// Like OccupancyHistory, only one process per database should run this.
+class AvailabilityCounters {
+  constructor(snapshot, { reconcileMs = 5 * 60 * 1000 } = {}) {
+    this.snapshot = snapshot;
+    this.reconcileMs = reconcileMs;
+    this.rooms = new Map(); // room_id -> { building, floor, available }
+    this._seeded = false;
+    this._queue = Promise.resolve();
+    this._timer = null;
+
+    this._onChange = change => this._apply(change);
+    snapshot.on('change', this._onChange);
+  }
+
+  start() {
+    this._timer = setInterval(() => this.reconcile(), this.reconcileMs);
+    this._timer.unref();
+  }
+
+  async stop() {
+    clearInterval(this._timer);
+    this._timer = null;
+    this.snapshot.off('change', this._onChange);
+    await this._queue;
+  }
+
+  // Writes run one at a time so a recount never interleaves with increments
+  _enqueue(write) {
+    this._queue = this._queue.then(write).catch(err => {
+      console.error('Availability counter update failed:', err.message);
+    });
+    return this._queue;
+  }
+
+  _apply({ changed, removed }) {
+    if (!this._seeded) {
+      for (const doc of changed) {
+        this.rooms.set(doc.room_id, { building: doc.building, floor: doc.floor, available: isAvailable(doc) });
+      }
+      this._seeded = true;
+      this.reconcile();
+      return;
+    }
+
+    const deltas = new Map(); // "building|floor" -> { building, floor, available, total }
+    const bump = (room, sign) => {
+      if (typeof room.building !== 'string' || typeof room.floor !== 'number') return;
+      const id = `${room.building}|${room.floor}`;
+      let delta = deltas.get(id);
+      if (!delta) {
+        delta = { building: room.building, floor: room.floor, available: 0, total: 0 };
+        deltas.set(id, delta);
+      }
+      delta.available += sign * room.available;
+      delta.total += sign;
+    };
+
+    for (const doc of changed) {
+      const prev = this.rooms.get(doc.room_id);
+      const next = { building: doc.building, floor: doc.floor, available: isAvailable(doc) };
+      if (prev && prev.building === next.building && prev.floor === next.floor && prev.available === next.available) continue;
+      if (prev) bump(prev, -1);
+      bump(next, 1);
+      this.rooms.set(doc.room_id, next);
+    }
+    for (const roomId of removed) {
+      const prev = this.rooms.get(roomId);
+      if (!prev) continue;
+      bump(prev, -1);
+      this.rooms.delete(roomId);
+    }
+
+    const ops = [];
+    for (const { building, floor, available, total } of deltas.values()) {
+      if (available === 0 && total === 0) continue;
+      // A floor missing from the layout is added by the next reconcile
+      ops.push({
+        updateOne: {
+          filter: { name: building, 'floors.floor': floor },
+          update: { $inc: { available, total, 'floors.$.available': available, 'floors.$.total': total } }
+        }
+      });
+    }
+    if (ops.length) this._enqueue(() => Building.bulkWrite(ops, { ordered: false }));
+  }
+
+  // Counts are taken now, so they match every increment queued before this
+  // write and none queued after it
+  reconcile() {
+    if (!this._seeded) return this._queue;
+    const counts = this._count();
+    return this._enqueue(() => this._reconcile(counts));
+  }
+
+  // name -> Map(floor -> { available, total }) from `rooms`
+  _count() {
+    const byBuilding = new Map();
+    for (const room of this.rooms.values()) {
+      if (typeof room.building !== 'string' || typeof room.floor !== 'number') continue;
+      if (!byBuilding.has(room.building)) byBuilding.set(room.building, new Map());
+      const floors = byBuilding.get(room.building);
+      if (!floors.has(room.floor)) floors.set(room.floor, { available: 0, total: 0 });
+      const counts = floors.get(room.floor);
+      counts.available += room.available;
+      counts.total += 1;
+    }
+    return byBuilding;
+  }
+
+  async _reconcile(byBuilding) {
+    const buildings = await Building.find({}, { name: 1, floors: 1, available: 1, total: 1 }).lean();
+    const existing = new Map(buildings.map(building => [building.name, building]));
+    const names = new Set([...existing.keys(), ...byBuilding.keys()]);
+
+    const ops = [];
+    let drift = 0;
+    for (const name of names) {
+      const floorCounts = byBuilding.get(name) || new Map();
+      const layout = existing.has(name) ? existing.get(name).floors.map(f => f.floor) : [];
+      const extra = [...floorCounts.keys()].filter(floor => !layout.includes(floor)).sort((a, b) => a - b);
+      const floors = [...layout, ...extra].map(floor => ({
+        floor,
+        available: floorCounts.has(floor) ? floorCounts.get(floor).available : 0,
+        total: floorCounts.has(floor) ? floorCounts.get(floor).total : 0
+      }));
+      const available = floors.reduce((sum, f) => sum + f.available, 0);
+      const total = floors.reduce((sum, f) => sum + f.total, 0);
+      const before = existing.get(name);
+      if (before) drift += Math.abs(before.available - available) + Math.abs(before.total - total);
+      ops.push({
+        updateOne: {
+          filter: { name },
+          update: { $set: { floors, available, total }, $setOnInsert: { defaultFloor: floors.length ? floors[0].floor : null } },
+          upsert: true
+        }
+      });
+    }
+    if (ops.length) await Building.bulkWrite(ops, { ordered: false });
+    if (drift) console.log(`Availability counters reconciled (corrected by ${drift})`);
+  }
+}
+
+module.exports = { AvailabilityCounters };
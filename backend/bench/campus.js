@@ -0,0 +1,217 @@
+// Seeded synthetic campus: building layout, current seat state and a history
+// of occupancy sessions with the rollups OccupancyHistory would have written
+// for it. The same seed and preset always produce the same data.
+const { PERIODS } = require('../occupancyHistory');
+
+const HOUR = PERIODS.hour;
+const DAY = PERIODS.day;
+
+const PRESETS = {
+  small: { buildings: 3, floors: [1, 8], seatsPerFloor: [20, 60], days: 14, roomHours: true },
+  medium: { buildings: 20, floors: [2, 10], seatsPerFloor: [30, 80], days: 28, roomHours: false },
+  large: { buildings: 100, floors: [2, 12], seatsPerFloor: [40, 120], days: 84, roomHours: false }
+};
+
+const NAMED_BUILDINGS = [
+  { code: 'SLC', name: 'Student Learning Centre (SLC)' },
+  { code: 'ENG', name: 'George Vari Engineering and Computing Centre' },
+  { code: 'TRS', name: 'Ted Rogers School of Management' }
+];
+
+// mulberry32
+function createRng(seed) {
+  let state = seed >>> 0;
+  const next = () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+  return {
+    next,
+    int: (min, max) => min + Math.floor(next() * (max - min + 1)),
+    pick: values => values[Math.floor(next() * values.length)]
+  };
+}
+
+function generateLayout(rng, preset) {
+  const buildings = [];
+  for (let b = 0; b < preset.buildings; b++) {
+    const named = NAMED_BUILDINGS[b] || { code: `B${String(b).padStart(3, '0')}`, name: `Building ${b}` };
+    const lowest = rng.int(1, 3);
+    const floorCount = rng.int(...preset.floors);
+    const floors = [];
+    for (let f = 0; f < floorCount; f++) {
+      floors.push({ floor: lowest + f, seats: rng.int(...preset.seatsPerFloor) });
+    }
+    buildings.push({ ...named, floors, defaultFloor: floors[Math.floor(floors.length / 2)].floor });
+  }
+  return buildings;
+}
+
+function generateSeats(rng, layout) {
+  const seats = [];
+  for (const building of layout) {
+    for (const { floor, seats: count } of building.floors) {
+      for (let i = 0; i < count; i++) {
+        seats.push({
+          room_id: `${building.code}-${floor}-${String(i).padStart(3, '0')}`,
+          building: building.name,
+          floor,
+          occupied: rng.next() < 0.4 ? 1 : 0,
+          accessible: rng.next() < 0.15,
+          capacity: rng.pick([1, 1, 1, 2, 4, 6]),
+          co2_ppm: rng.int(400, 1200),
+          temperature_c: rng.int(190, 250) / 10
+        });
+      }
+    }
+  }
+  return seats;
+}
+
+// Rollup rows keyed like the unique index on OccupancyRollups
+class RollupAccumulator {
+  constructor() {
+    this.rows = new Map();
+  }
+
+  row(level, key, period, start, building, floor) {
+    const id = `${level}|${key}|${period}|${start}`;
+    let row = this.rows.get(id);
+    if (!row) {
+      row = { level, key, period, start: new Date(start), building, floor, observed_ms: 0, occupied_ms: 0, span_ms: 0, peak: 0 };
+      this.rows.set(id, row);
+    }
+    return row;
+  }
+
+  drain() {
+    const rows = [...this.rows.values()];
+    this.rows.clear();
+    return rows;
+  }
+}
+
+// Calls fn(hourStart, from, to) for each hour-aligned piece of [from, to)
+function eachHour(from, to, fn) {
+  while (from < to) {
+    const hourStart = Math.floor(from / HOUR) * HOUR;
+    const end = Math.min(to, hourStart + HOUR);
+    fn(hourStart, from, end);
+    from = end;
+  }
+}
+
+// One building's day: occupancy sessions between 08:00 and 22:00 for every
+// seat, as raw change events plus room, floor and building rollups
+function generateBuildingDay(rng, building, dayStart, preset, acc) {
+  const events = [];
+  const changes = []; // [t, floor, +1 | -1] for the floor/building sweep
+  const open = dayStart + 8 * HOUR;
+  const close = dayStart + 22 * HOUR;
+
+  for (const { floor, seats } of building.floors) {
+    for (let i = 0; i < seats; i++) {
+      const roomId = `${building.code}-${floor}-${String(i).padStart(3, '0')}`;
+      const meta = { room_id: roomId, building: building.name, floor };
+      const roomDay = acc.row('room', roomId, 'day', dayStart, building.name, floor);
+      roomDay.observed_ms += DAY;
+      roomDay.span_ms += DAY;
+      if (preset.roomHours) {
+        for (let h = 0; h < 24; h++) {
+          const row = acc.row('room', roomId, 'hour', dayStart + h * HOUR, building.name, floor);
+          row.observed_ms += HOUR;
+          row.span_ms += HOUR;
+        }
+      }
+
+      let t = open + rng.int(0, 120) * 60000;
+      while (t < close && rng.next() < 0.7) {
+        const end = Math.min(close, t + rng.int(30, 180) * 60000);
+        events.push({ ts: new Date(t), meta, occupied: 1 }, { ts: new Date(end), meta, occupied: 0 });
+        changes.push([t, floor, 1], [end, floor, -1]);
+        roomDay.occupied_ms += end - t;
+        roomDay.peak = 1;
+        if (preset.roomHours) {
+          eachHour(t, end, (hourStart, from, to) => {
+            const row = acc.row('room', roomId, 'hour', hourStart, building.name, floor);
+            row.occupied_ms += to - from;
+            row.peak = 1;
+          });
+        }
+        t = end + rng.int(15, 120) * 60000;
+      }
+    }
+  }
+
+  // Sweep the day's changes in time order to integrate how many seats were
+  // occupied at once on each floor and in the building
+  const seatsOn = new Map(building.floors.map(f => [f.floor, f.seats]));
+  const totalSeats = building.floors.reduce((sum, f) => sum + f.seats, 0);
+  const levels = [['building', building.name, undefined, totalSeats]];
+  for (const { floor } of building.floors) levels.push(['floor', `${building.name}|${floor}`, floor, seatsOn.get(floor)]);
+  for (const [level, key, floor, seats] of levels) {
+    for (let h = 0; h < 24; h++) {
+      const row = acc.row(level, key, 'hour', dayStart + h * HOUR, building.name, floor);
+      row.observed_ms += seats * HOUR;
+      row.span_ms += HOUR;
+    }
+    const day = acc.row(level, key, 'day', dayStart, building.name, floor);
+    day.observed_ms += seats * DAY;
+    day.span_ms += DAY;
+  }
+
+  changes.sort((a, b) => a[0] - b[0] || a[2] - b[2]);
+  const count = new Map(); // floor -> occupied now; undefined -> building
+  let last = dayStart;
+  const credit = (to) => {
+    eachHour(last, to, (hourStart, from, end) => {
+      for (const [level, key, floor] of levels) {
+        const occupied = count.get(floor) || 0;
+        if (!occupied) continue;
+        const hour = acc.row(level, key, 'hour', hourStart, building.name, floor);
+        hour.occupied_ms += occupied * (end - from);
+        hour.peak = Math.max(hour.peak, occupied);
+        const day = acc.row(level, key, 'day', dayStart, building.name, floor);
+        day.occupied_ms += occupied * (end - from);
+        day.peak = Math.max(day.peak, occupied);
+      }
+    });
+    last = to;
+  };
+  for (const [t, floor, delta] of changes) {
+    credit(t);
+    count.set(floor, (count.get(floor) || 0) + delta);
+    count.set(undefined, (count.get(undefined) || 0) + delta);
+  }
+  credit(dayStart + DAY);
+
+  events.sort((a, b) => a.ts - b.ts);
+  return events;
+}
+
+// Yields { day, events, rollups } for each day ending yesterday, oldest first
+function* generateHistory(seed, layout, preset, days = preset.days, now = Date.now()) {
+  const today = Math.floor(now / DAY) * DAY;
+  for (let d = days; d >= 1; d--) {
+    const dayStart = today - d * DAY;
+    // Seeded per day so a given day has the same data whatever `days` is
+    const rng = createRng(seed * 100003 + d);
+    const acc = new RollupAccumulator();
+    const events = [];
+    for (const building of layout) {
+      for (const event of generateBuildingDay(rng, building, dayStart, preset, acc)) events.push(event);
+    }
+    yield { day: new Date(dayStart), events, rollups: acc.drain() };
+  }
+}
+
+function generateCampus(seed, preset) {
+  const rng = createRng(seed);
+  const layout = generateLayout(rng, preset);
+  return { layout, seats: generateSeats(rng, layout) };
+}
+
+module.exports = { PRESETS, createRng, generateCampus, generateHistory };
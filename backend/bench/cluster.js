@@ -0,0 +1,130 @@
+// Throughput of server.js as a cluster of 1, 2, 4... workers on a seeded
+// campus. Each worker count is a fresh server.js process; load comes from
+// LOAD_THREADS worker threads so the generator isn't the bottleneck.
+//   node bench/cluster.js [small|medium|large] [--seed N]
+//   WORKER_COUNTS (e.g. 1,2,4), LOAD_THREADS, CONNECTIONS, DURATION_MS to tune.
+const { spawn } = require('child_process');
+const os = require('os');
+const path = require('path');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
+const mongoose = require('mongoose');
+const { startMongo } = require('./mongo');
+const { seedCampus } = require('./seed');
+const { createRng } = require('./campus');
+const { load, formatResult } = require('./loadgen');
+
+const CONNECTIONS = Number(process.env.CONNECTIONS) || 64;
+const DURATION_MS = Number(process.env.DURATION_MS) || 5000;
+const PORT = Number(process.env.BENCH_PORT) || 5055;
+const CORES = os.availableParallelism();
+// Half the cores drive load, so by default workers go up to the other half
+const LOAD_THREADS = Number(process.env.LOAD_THREADS) || Math.max(1, Math.floor(CORES / 2));
+const WORKER_COUNTS = process.env.WORKER_COUNTS
+  ? process.env.WORKER_COUNTS.split(',').map(Number)
+  : [1, 2, 4, 8, 16].filter(n => n === 1 || n <= CORES - LOAD_THREADS);
+
+function arg(name, fallback) {
+  const i = process.argv.indexOf(`--${name}`);
+  return i === -1 ? fallback : Number(process.argv[i + 1]);
+}
+
+// Load thread: cycles through `urls` on its share of the connections
+async function loadThread() {
+  const { urls, connections, durationMs } = workerData;
+  let next = 0;
+  parentPort.postMessage(await load({ url: () => urls[next++ % urls.length], connections, durationMs }));
+}
+
+// Sums throughput across threads; latencies are the slowest thread's
+function runLoad(urls) {
+  const threads = Array.from({ length: LOAD_THREADS }, (_, i) => new Promise((resolve, reject) => {
+    const connections = Math.floor(CONNECTIONS / LOAD_THREADS) + (i < CONNECTIONS % LOAD_THREADS ? 1 : 0);
+    const worker = new Worker(__filename, { workerData: { urls, connections, durationMs: DURATION_MS } });
+    worker.once('message', resolve);
+    worker.once('error', reject);
+  }));
+  return Promise.all(threads).then(results => {
+    const total = { requests: 0, rps: 0, p50: 0, p95: 0, p99: 0, statuses: {}, errors: 0 };
+    for (const r of results) {
+      total.requests += r.requests;
+      total.rps += r.rps;
+      total.errors += r.errors;
+      for (const key of ['p50', 'p95', 'p99']) total[key] = Math.max(total[key], r[key]);
+      for (const [status, count] of Object.entries(r.statuses)) {
+        total.statuses[status] = (total.statuses[status] || 0) + count;
+      }
+    }
+    return total;
+  });
+}
+
+// Starts server.js and resolves once every worker is listening
+function launch(uri, workers) {
+  const child = spawn(process.execPath, [path.join(__dirname, '..', 'server.js')], {
+    env: { ...process.env, MONGODB_URI: uri, PORT: String(PORT), WORKERS: String(workers) },
+    stdio: ['ignore', 'pipe', 'inherit']
+  });
+  return new Promise((resolve, reject) => {
+    let listening = 0;
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', text => {
+      listening += (text.match(/Backend running/g) || []).length;
+      if (listening === workers) resolve(child);
+    });
+    child.once('exit', code => reject(new Error(`server.js exited with ${code}`)));
+  });
+}
+
+function stopServer(child) {
+  return new Promise(resolve => {
+    child.removeAllListeners('exit');
+    child.once('exit', resolve);
+    child.kill('SIGTERM');
+  });
+}
+
+async function main() {
+  const preset = process.argv[2] && !process.argv[2].startsWith('--') ? process.argv[2] : 'small';
+  const seed = arg('seed', 1);
+  const mongo = await startMongo();
+  await mongoose.connect(mongo.uri);
+  const { layout } = await seedCampus({ preset, seed, days: 1 });
+  await mongoose.disconnect();
+
+  const base = `http://127.0.0.1:${PORT}`;
+  const rng = createRng(seed);
+  const scenarios = {
+    'GET /api/seats': [`${base}/api/seats`],
+    'GET /api/seats/query': Array.from({ length: 1000 }, () => {
+      const building = rng.pick(layout);
+      const params = new URLSearchParams({ building: building.name, floor: String(rng.pick(building.floors).floor) });
+      if (rng.next() < 0.5) params.set('available', '1');
+      return `${base}/api/seats/query?${params}`;
+    })
+  };
+
+  console.log(`${CORES} cores, ${LOAD_THREADS} load threads, ${CONNECTIONS} connections, ${DURATION_MS}ms per run`);
+  const first = {};
+  for (const workers of WORKER_COUNTS) {
+    const child = await launch(mongo.uri, workers);
+    for (const [name, urls] of Object.entries(scenarios)) {
+      const result = await runLoad(urls);
+      // Speedup is relative to the first (normally single-worker) run
+      first[name] = first[name] || result.rps;
+      const speedup = (result.rps / first[name]).toFixed(2);
+      console.log(`${formatResult(`${name} x${workers}`, result)}  ${speedup}x`);
+    }
+    await stopServer(child);
+  }
+
+  await mongo.stop();
+}
+
+if (isMainThread) {
+  main().catch(err => {
+    console.error(err);
+    process.exit(1);
+  });
+} else {
+  loadThread();
+}
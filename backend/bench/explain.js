@@ -0,0 +1,68 @@
+// Explains every /api/seats/query shape and fails if any of them scans the
+// collection, sorts in memory, or walks an index not led by `building`.
+//   node bench/explain.js
+const mongoose = require('mongoose');
+const { Seat } = require('../models');
+const { buildSeatQuery } = require('../seatQuery');
+const { startMongo } = require('./mongo');
+
+const SHAPES = [
+  { building: 'B0' },
+  { building: 'B0', floor: '3' },
+  { building: 'B0', floor: '3', available: '1' },
+  { building: 'B0', floor: '3', accessible: '1' },
+  { building: 'B0', floor: '3', partySize: '4' },
+  { building: 'B0', floor: '3', available: '1', accessible: '1', partySize: '2' },
+  { building: 'B0', available: '1', partySize: '3' },
+  { building: 'B0', floor: '3', available: '1', cursor: Buffer.from('R00100').toString('base64url') }
+];
+
+function stages(plan, out = []) {
+  if (!plan) return out;
+  out.push(plan.stage === 'IXSCAN' ? `IXSCAN ${plan.indexName}` : plan.stage);
+  if (plan.inputStage) stages(plan.inputStage, out);
+  for (const child of plan.inputStages || []) stages(child, out);
+  return out;
+}
+
+async function main() {
+  const mongo = await startMongo();
+  await mongoose.connect(mongo.uri);
+  await Seat.deleteMany({});
+  await Seat.syncIndexes();
+  const docs = [];
+  for (let i = 0; i < 5000; i++) {
+    docs.push({
+      room_id: `R${String(i).padStart(5, '0')}`,
+      building: `B${i % 5}`,
+      floor: i % 10,
+      occupied: i % 3 === 0 ? 1 : 0,
+      accessible: i % 4 === 0,
+      capacity: 1 + (i % 6)
+    });
+  }
+  await Seat.insertMany(docs);
+
+  let failed = 0;
+  for (const params of SHAPES) {
+    const { filter, sort, projection, limit, hint } = buildSeatQuery(params);
+    const explain = await Seat.find(filter, projection).sort(sort).hint(hint).limit(limit + 1).explain('executionStats');
+    const winning = stages(explain.queryPlanner.winningPlan.queryPlan || explain.queryPlanner.winningPlan);
+    const { totalKeysExamined, totalDocsExamined, nReturned } = explain.executionStats;
+    const scans = winning.filter(stage => stage.startsWith('IXSCAN'));
+    const ok = scans.length > 0 && scans.every(stage => stage.startsWith('IXSCAN building_1')) &&
+      !winning.includes('COLLSCAN') && !winning.includes('SORT');
+    if (!ok) failed += 1;
+    console.log(`${ok ? 'ok  ' : 'FAIL'} ${JSON.stringify(params)}\n     ${winning.join(' <- ')}  ` +
+      `keys ${totalKeysExamined} docs ${totalDocsExamined} returned ${nReturned}`);
+  }
+
+  await mongoose.disconnect();
+  await mongo.stop();
+  process.exit(failed ? 1 : 0);
+}
+
+main().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,72 @@
+// POST /api/readings throughput and flush latency.
+//   node bench/ingest.js           (ROOMS, BATCH, CONNECTIONS, DURATION_MS to tune)
+const mongoose = require('mongoose');
+const { Seat } = require('../models');
+const { ReadingBuffer } = require('../readingBuffer');
+const { createApp } = require('../app');
+const { startMongo } = require('./mongo');
+const { load, formatResult, percentile } = require('./loadgen');
+
+const ROOMS = Number(process.env.ROOMS) || 2000;
+const BATCH = Number(process.env.BATCH) || 500;
+const CONNECTIONS = Number(process.env.CONNECTIONS) || 20;
+const DURATION_MS = Number(process.env.DURATION_MS) || 5000;
+
+function ndjsonBatch() {
+  const lines = [];
+  for (let i = 0; i < BATCH; i++) {
+    const room = Math.floor(Math.random() * ROOMS);
+    lines.push(JSON.stringify({
+      room_id: `R${String(room).padStart(5, '0')}`,
+      occupied: Math.random() < 0.4 ? 1 : 0,
+      co2_ppm: 400 + Math.round(Math.random() * 800),
+      temperature_c: Math.round((19 + Math.random() * 6) * 10) / 10
+    }));
+  }
+  return lines.join('\n');
+}
+
+async function main() {
+  const mongo = await startMongo();
+  await mongoose.connect(mongo.uri);
+  await Seat.deleteMany({});
+  await Seat.syncIndexes();
+
+  const readings = new ReadingBuffer(Seat);
+  const flushes = [];
+  readings.on('flush', ({ rooms, ms }) => flushes.push({ rooms, ms }));
+  readings.start();
+
+  const app = createApp({ readings });
+  const server = await new Promise(resolve => {
+    const s = app.listen(0, () => resolve(s));
+  });
+
+  console.log(`${ROOMS} rooms, ${BATCH} readings per request, ${CONNECTIONS} connections, ${DURATION_MS}ms`);
+  const result = await load({
+    url: `http://127.0.0.1:${server.address().port}/api/readings`,
+    method: 'POST',
+    headers: { 'Content-Type': 'application/x-ndjson' },
+    body: ndjsonBatch,
+    connections: CONNECTIONS,
+    durationMs: DURATION_MS
+  });
+  await readings.stop();
+  server.close();
+
+  const accepted = (result.statuses[202] || 0) * BATCH;
+  const flushMs = flushes.map(f => f.ms).sort((a, b) => a - b);
+  console.log(formatResult('POST /api/readings', result));
+  console.log(`readings/s ${Math.round(accepted / (DURATION_MS / 1000))}  ` +
+    `coalesced ${readings.stats.coalesced}  written ${readings.stats.written}  failed ${readings.stats.failed}`);
+  console.log(`flushes ${flushes.length}  rooms/flush ${Math.round(readings.stats.written / Math.max(1, flushes.length))}  ` +
+    `flush p50 ${percentile(flushMs, 0.5)}ms  p99 ${percentile(flushMs, 0.99)}ms`);
+
+  await mongoose.disconnect();
+  await mongo.stop();
+}
+
+main().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
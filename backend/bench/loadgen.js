@@ -0,0 +1,63 @@
+const http = require('http');
+
+function percentile(sorted, p) {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+// Closed-loop load: `connections` keep-alive sockets each issue requests back
+// to back for `durationMs`. Latencies are in milliseconds. `url` and `body`
+// may be functions, called once per request.
+async function load({ url, connections = 50, durationMs = 5000, method = 'GET', headers = {}, body = null }) {
+  const agent = new http.Agent({ keepAlive: true, maxSockets: connections });
+  const fixed = typeof url === 'function' ? null : new URL(url);
+  const latencies = [];
+  const statuses = {};
+  let errors = 0;
+  const started = process.hrtime.bigint();
+  const deadline = Date.now() + durationMs;
+
+  const once = () => new Promise(resolve => {
+    const t0 = process.hrtime.bigint();
+    const target = fixed || new URL(url());
+    const req = http.request(target, { agent, method, headers }, res => {
+      res.on('data', () => {});
+      res.on('end', () => {
+        latencies.push(Number(process.hrtime.bigint() - t0) / 1e6);
+        statuses[res.statusCode] = (statuses[res.statusCode] || 0) + 1;
+        resolve();
+      });
+    });
+    req.on('error', () => {
+      errors += 1;
+      resolve();
+    });
+    req.end(typeof body === 'function' ? body() : body);
+  });
+
+  const worker = async () => {
+    while (Date.now() < deadline) await once();
+  };
+  await Promise.all(Array.from({ length: connections }, worker));
+  agent.destroy();
+
+  const elapsed = Number(process.hrtime.bigint() - started) / 1e9;
+  latencies.sort((a, b) => a - b);
+  return {
+    requests: latencies.length,
+    rps: Math.round(latencies.length / elapsed),
+    p50: percentile(latencies, 0.5),
+    p95: percentile(latencies, 0.95),
+    p99: percentile(latencies, 0.99),
+    statuses,
+    errors
+  };
+}
+
+function formatResult(name, r) {
+  return `${name.padEnd(28)} ${String(r.rps).padStart(8)} req/s  ` +
+    `p50 ${r.p50.toFixed(2)}ms  p95 ${r.p95.toFixed(2)}ms  p99 ${r.p99.toFixed(2)}ms  ` +
+    `status ${JSON.stringify(r.statuses)}${r.errors ? `  errors ${r.errors}` : ''}`;
+}
+
+module.exports = { load, formatResult, percentile };
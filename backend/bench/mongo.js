@@ -0,0 +1,19 @@
+// Uses MONGODB_URI when set, otherwise a throwaway single-node replica set
+// from mongodb-memory-server (a replica set so change streams work). That
+// package is not a dependency; install it with
+// `npm install --no-save mongodb-memory-server` to bench without a database.
+async function startMongo() {
+  if (process.env.MONGODB_URI) {
+    return { uri: process.env.MONGODB_URI, stop: async () => {} };
+  }
+  let MongoMemoryReplSet;
+  try {
+    ({ MongoMemoryReplSet } = require('mongodb-memory-server'));
+  } catch (err) {
+    throw new Error('Set MONGODB_URI, or run `npm install --no-save mongodb-memory-server` for a throwaway database');
+  }
+  const replSet = await MongoMemoryReplSet.create({ replSet: { count: 1 } });
+  return { uri: replSet.getUri('tmu_bench'), stop: () => replSet.stop() };
+}
+
+module.exports = { startMongo };
@@ -0,0 +1,57 @@
+// GET /api/seats with the snapshot cache off, on, and on with revalidation.
+//   node bench/seats.js            (SEATS, CONNECTIONS, DURATION_MS to tune)
+const mongoose = require('mongoose');
+const { Seat } = require('../models');
+const { SeatSnapshot } = require('../seatSnapshot');
+const { createApp } = require('../app');
+const { startMongo } = require('./mongo');
+const { load, formatResult } = require('./loadgen');
+
+const SEATS = Number(process.env.SEATS) || 2000;
+const CONNECTIONS = Number(process.env.CONNECTIONS) || 50;
+const DURATION_MS = Number(process.env.DURATION_MS) || 5000;
+
+function listen(app) {
+  return new Promise(resolve => {
+    const server = app.listen(0, () => resolve(server));
+  });
+}
+
+async function main() {
+  const mongo = await startMongo();
+  await mongoose.connect(mongo.uri);
+  await Seat.deleteMany({});
+  await Seat.insertMany(Array.from({ length: SEATS }, (_, i) => ({
+    room_id: `R${String(i).padStart(5, '0')}`,
+    occupied: i % 3 === 0 ? 1 : 0
+  })));
+
+  console.log(`${SEATS} seats, ${CONNECTIONS} connections, ${DURATION_MS}ms per run`);
+
+  let server = await listen(createApp());
+  let url = `http://127.0.0.1:${server.address().port}/api/seats`;
+  console.log(formatResult('cache off', await load({ url, connections: CONNECTIONS, durationMs: DURATION_MS })));
+  server.close();
+
+  const snapshot = new SeatSnapshot(Seat);
+  await snapshot.start();
+  server = await listen(createApp({ snapshot }));
+  url = `http://127.0.0.1:${server.address().port}/api/seats`;
+  console.log(formatResult('cache on', await load({ url, connections: CONNECTIONS, durationMs: DURATION_MS })));
+  console.log(formatResult('cache on, If-None-Match', await load({
+    url,
+    connections: CONNECTIONS,
+    durationMs: DURATION_MS,
+    headers: { 'If-None-Match': snapshot.etag }
+  })));
+  server.close();
+  snapshot.stop();
+
+  await mongoose.disconnect();
+  await mongo.stop();
+}
+
+main().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
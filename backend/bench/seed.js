@@ -0,0 +1,76 @@
+// Loads a synthetic campus (see campus.js) into Mongo, replacing what is there.
+//   node bench/seed.js [small|medium|large] [--seed N] [--days N]
+// Uses MONGODB_URI when set, otherwise a throwaway in-memory server.
+const mongoose = require('mongoose');
+const { Seat, Building, OccupancyEvent, OccupancyRollup } = require('../models');
+const { PRESETS, generateCampus, generateHistory } = require('./campus');
+const { startMongo } = require('./mongo');
+
+const CHUNK = 10000;
+
+async function insertChunked(model, docs) {
+  for (let i = 0; i < docs.length; i += CHUNK) {
+    await model.insertMany(docs.slice(i, i + CHUNK), { ordered: false, lean: true });
+  }
+}
+
+async function seedCampus({ preset = 'small', seed = 1, days, log = console.log } = {}) {
+  const config = PRESETS[preset];
+  if (!config) throw new Error(`Unknown preset ${preset}`);
+  const { layout, seats } = generateCampus(seed, config);
+
+  await Promise.all([Seat, Building, OccupancyEvent, OccupancyRollup].map(model => model.deleteMany({})));
+  await Promise.all([Seat, Building, OccupancyRollup].map(model => model.syncIndexes()));
+
+  await insertChunked(Seat, seats);
+  const counts = new Map(); // "building|floor" -> { available, total }
+  for (const seat of seats) {
+    const id = `${seat.building}|${seat.floor}`;
+    if (!counts.has(id)) counts.set(id, { available: 0, total: 0 });
+    counts.get(id).total += 1;
+    if (seat.occupied === 0) counts.get(id).available += 1;
+  }
+  await Building.insertMany(layout.map(building => {
+    const floors = building.floors.map(({ floor }) => ({ floor, ...counts.get(`${building.name}|${floor}`) }));
+    return {
+      name: building.name,
+      defaultFloor: building.defaultFloor,
+      floors,
+      available: floors.reduce((sum, f) => sum + f.available, 0),
+      total: floors.reduce((sum, f) => sum + f.total, 0)
+    };
+  }));
+
+  let events = 0;
+  let rollups = 0;
+  for (const day of generateHistory(seed, layout, config, days)) {
+    await insertChunked(OccupancyEvent, day.events);
+    await insertChunked(OccupancyRollup, day.rollups);
+    events += day.events.length;
+    rollups += day.rollups.length;
+  }
+  const summary = { preset, seed, buildings: layout.length, seats: seats.length, events, rollups };
+  log(`Seeded ${JSON.stringify(summary)}`);
+  return { layout, seats, summary };
+}
+
+module.exports = { seedCampus };
+
+function arg(name, fallback) {
+  const i = process.argv.indexOf(`--${name}`);
+  return i === -1 ? fallback : Number(process.argv[i + 1]);
+}
+
+if (require.main === module) {
+  (async () => {
+    const mongo = await startMongo();
+    await mongoose.connect(mongo.uri);
+    const preset = process.argv[2] && !process.argv[2].startsWith('--') ? process.argv[2] : 'small';
+    await seedCampus({ preset, seed: arg('seed', 1), days: arg('days', undefined) });
+    await mongoose.disconnect();
+    await mongo.stop();
+  })().catch(err => {
+    console.error(err);
+    process.exit(1);
+  });
+}
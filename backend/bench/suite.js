@@ -0,0 +1,155 @@
+// Load-test suite: seeds a synthetic campus, starts the app in-process as
+// server.js wires it, and measures every read endpoint, ingestion and
+// analytics. Results are written to bench/results/ and compared with
+// bench/baseline.json when it exists.
+//   node bench/suite.js [small|medium|large] [--seed N] [--save-baseline]
+//   CONNECTIONS, DURATION_MS, BENCH_TOLERANCE (default 0.2) to tune.
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const mongoose = require('mongoose');
+const { Seat } = require('../models');
+const { SeatSnapshot } = require('../seatSnapshot');
+const { ReadingBuffer } = require('../readingBuffer');
+const { OccupancyHistory } = require('../occupancyHistory');
+const { AvailabilityCounters } = require('../availabilityCounters');
+const { createApp } = require('../app');
+const { startMongo } = require('./mongo');
+const { seedCampus } = require('./seed');
+const { createRng } = require('./campus');
+const { load, formatResult } = require('./loadgen');
+
+const CONNECTIONS = Number(process.env.CONNECTIONS) || 50;
+const DURATION_MS = Number(process.env.DURATION_MS) || 5000;
+const TOLERANCE = Number(process.env.BENCH_TOLERANCE) || 0.2;
+const BASELINE = path.join(__dirname, 'baseline.json');
+const RESULTS = path.join(__dirname, 'results');
+
+function arg(name, fallback) {
+  const i = process.argv.indexOf(`--${name}`);
+  return i === -1 ? fallback : Number(process.argv[i + 1]);
+}
+
+function scenarios(base, layout, seats, snapshot, rng) {
+  const floorParams = () => {
+    const building = rng.pick(layout);
+    return new URLSearchParams({ building: building.name, floor: String(rng.pick(building.floors).floor) });
+  };
+  return {
+    'GET /api/seats': { url: `${base}/api/seats` },
+    'GET /api/seats (304)': { url: `${base}/api/seats`, headers: { 'If-None-Match': snapshot.etag } },
+    'GET /api/seats/query': {
+      url: () => {
+        const params = floorParams();
+        if (rng.next() < 0.5) params.set('available', '1');
+        if (rng.next() < 0.2) params.set('accessible', '1');
+        params.set('partySize', String(rng.pick([1, 1, 2, 4])));
+        return `${base}/api/seats/query?${params}`;
+      }
+    },
+    'GET /api/buildings': { url: `${base}/api/buildings` },
+    'GET /api/analytics': { url: () => `${base}/api/analytics?${floorParams()}` },
+    'GET /api/analytics/rooms': { url: () => `${base}/api/analytics/rooms?${floorParams()}` },
+    'POST /api/readings': {
+      url: `${base}/api/readings`,
+      method: 'POST',
+      headers: { 'Content-Type': 'application/x-ndjson' },
+      body: () => Array.from({ length: 200 }, () => JSON.stringify({
+        room_id: rng.pick(seats).room_id,
+        occupied: rng.next() < 0.4 ? 1 : 0,
+        co2_ppm: rng.int(400, 1200)
+      })).join('\n')
+    }
+  };
+}
+
+// Names of scenarios that got slower or less throughput than the baseline allows
+function regressions(results, baseline) {
+  const failed = [];
+  for (const [name, result] of Object.entries(results.scenarios)) {
+    const before = baseline.scenarios[name];
+    if (!before) continue;
+    if (result.rps < before.rps * (1 - TOLERANCE) || result.p99 > before.p99 * (1 + TOLERANCE)) {
+      failed.push(`${name}: ${before.rps} -> ${result.rps} req/s, p99 ${before.p99.toFixed(2)} -> ${result.p99.toFixed(2)}ms`);
+    }
+  }
+  return failed;
+}
+
+async function main() {
+  const preset = process.argv[2] && !process.argv[2].startsWith('--') ? process.argv[2] : 'small';
+  const seed = arg('seed', 1);
+  const mongo = await startMongo();
+  await mongoose.connect(mongo.uri);
+  const { layout, seats } = await seedCampus({ preset, seed });
+
+  const snapshot = new SeatSnapshot(Seat);
+  const readings = new ReadingBuffer(Seat);
+  const history = new OccupancyHistory(snapshot);
+  const counters = new AvailabilityCounters(snapshot);
+  await snapshot.start();
+  readings.start();
+  history.start();
+  counters.start();
+  const server = await new Promise(resolve => {
+    const s = createApp({ snapshot, readings }).listen(0, () => resolve(s));
+  });
+
+  const results = {
+    meta: {
+      preset,
+      seed,
+      connections: CONNECTIONS,
+      durationMs: DURATION_MS,
+      node: process.version,
+      cpus: os.cpus().length,
+      date: new Date().toISOString()
+    },
+    scenarios: {}
+  };
+  const rng = createRng(seed);
+  let failed = 0;
+  for (const [name, options] of Object.entries(scenarios(`http://127.0.0.1:${server.address().port}`, layout, seats, snapshot, rng))) {
+    const result = await load({ ...options, connections: CONNECTIONS, durationMs: DURATION_MS });
+    const bad = result.errors + Object.entries(result.statuses)
+      .filter(([status]) => Number(status) >= 400)
+      .reduce((sum, [, count]) => sum + count, 0);
+    if (bad) failed += 1;
+    results.scenarios[name] = result;
+    console.log(formatResult(name, result));
+  }
+
+  server.close();
+  await readings.stop();
+  await history.stop();
+  await counters.stop();
+  snapshot.stop();
+  await mongoose.disconnect();
+  await mongo.stop();
+
+  fs.mkdirSync(RESULTS, { recursive: true });
+  const file = path.join(RESULTS, `${results.meta.date.replace(/[:.]/g, '-')}-${preset}.json`);
+  fs.writeFileSync(file, `${JSON.stringify(results, null, 2)}\n`);
+  console.log(`Results written to ${path.relative(process.cwd(), file)}`);
+
+  if (process.argv.includes('--save-baseline')) {
+    fs.writeFileSync(BASELINE, `${JSON.stringify(results, null, 2)}\n`);
+    console.log('Saved as baseline');
+  } else if (fs.existsSync(BASELINE)) {
+    const baseline = JSON.parse(fs.readFileSync(BASELINE, 'utf8'));
+    if (baseline.meta.preset !== preset || baseline.meta.connections !== CONNECTIONS) {
+      console.log(`Baseline is for ${baseline.meta.preset}/${baseline.meta.connections} connections; not comparing`);
+    } else {
+      const slower = regressions(results, baseline);
+      for (const line of slower) console.log(`REGRESSION ${line}`);
+      if (slower.length) failed += slower.length;
+      else console.log(`No regressions against baseline (tolerance ${TOLERANCE * 100}%)`);
+    }
+  }
+  process.exit(failed ? 1 : 0);
+}
+
+main().catch(err => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,93 @@
+const cluster = require('cluster');
+
+// Resolves true once the worker is listening (server.js only listens when it
+// is ready), or false if it exits first
+function whenListening(worker) {
+  return new Promise(resolve => {
+    const onListening = () => {
+      worker.off('exit', onExit);
+      resolve(true);
+    };
+    const onExit = () => {
+      worker.off('listening', onListening);
+      resolve(false);
+    };
+    worker.once('listening', onListening);
+    worker.once('exit', onExit);
+  });
+}
+
+// Runs `workers` copies of server.js sharing one port. Worker 0 maintains
+// the shared aggregates (history and availability counters); the others run
+// with AGGREGATES=off. A worker that dies is replaced after `restartDelayMs`.
+//
+// SIGHUP restarts the workers one at a time without dropping traffic: each
+// replacement is started and warm before the old worker drains. The
+// aggregates worker is drained first instead, so its writes never run twice;
+// the other workers serve in the meantime. SIGTERM/SIGINT drain them all.
+function runPrimary({ workers, restartDelayMs = 1000 }) {
+  const slots = new Array(workers).fill(null);
+  const retiring = new Set(); // workers stopped on purpose, not to be replaced
+  let rolling = null;
+  let stopping = false;
+
+  const fork = i => {
+    const worker = cluster.fork({ AGGREGATES: i === 0 ? process.env.AGGREGATES || 'on' : 'off' });
+    worker.once('exit', (code, signal) => {
+      if (slots[i] === worker) slots[i] = null;
+      if (retiring.delete(worker) || stopping) return;
+      console.error(`Worker ${worker.process.pid} exited (${signal || code}), restarting`);
+      setTimeout(() => {
+        if (!stopping && !slots[i]) slots[i] = fork(i);
+      }, restartDelayMs);
+    });
+    return worker;
+  };
+
+  const retire = worker => new Promise(resolve => {
+    if (!worker || worker.isDead()) return resolve();
+    retiring.add(worker);
+    worker.once('exit', resolve);
+    worker.process.kill('SIGTERM');
+  });
+
+  const restartAll = async () => {
+    for (let i = 0; i < workers && !stopping; i++) {
+      const old = slots[i];
+      if (i === 0) await retire(old);
+      const replacement = fork(i);
+      slots[i] = replacement;
+      if (!(await whenListening(replacement))) {
+        // Other slots keep their old worker; slot 0's is already gone, so
+        // the exit handler keeps retrying it
+        console.error(`Replacement for worker ${i} failed to start; stopping the restart`);
+        if (i !== 0) slots[i] = old;
+        return;
+      }
+      if (i !== 0) await retire(old);
+    }
+    console.log('Rolling restart complete');
+  };
+
+  for (let i = 0; i < workers; i++) slots[i] = fork(i);
+  console.log(`Primary ${process.pid} started ${workers} workers`);
+
+  process.on('SIGHUP', () => {
+    if (rolling || stopping) return;
+    console.log('Rolling restart');
+    rolling = restartAll().finally(() => {
+      rolling = null;
+    });
+  });
+
+  const shutdown = async () => {
+    if (stopping) return;
+    stopping = true;
+    await Promise.all(Object.values(cluster.workers).map(retire));
+    process.exit(0);
+  };
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+}
+
+module.exports = { runPrimary };
@@ -0,0 +1,240 @@
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+// Minimal Prometheus registry: counters, gauges and histograms with labels,
+// rendered in the text exposition format. Recording is a Map lookup and a
+// few additions, cheap enough to leave on for every request and command.
+
+const LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5];
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function formatLabels(names, values, extra = '') {
+  const pairs = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+  if (extra) pairs.push(extra);
+  return pairs.length ? `{${pairs.join(',')}}` : '';
+}
+
+class Metric {
+  constructor(type, name, help, labelNames = []) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map(); // joined label values -> { labels, ... }
+  }
+
+  _series(labels, create) {
+    const key = labels.join('\u0000');
+    let series = this.series.get(key);
+    if (!series) {
+      series = create(labels);
+      this.series.set(key, series);
+    }
+    return series;
+  }
+
+  render() {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`, ...this._lines()].join('\n');
+  }
+}
+
+// Counters and gauges hold one value per label set. `collect`, when given,
+// is called at scrape time to set the current values from elsewhere.
+class Scalar extends Metric {
+  constructor(type, name, help, labelNames, collect) {
+    super(type, name, help, labelNames);
+    this.collect = collect;
+  }
+
+  set(labels, value) {
+    this._series(labels, () => ({ labels, value: 0 })).value = value;
+  }
+
+  inc(labels = [], value = 1) {
+    this._series(labels, () => ({ labels, value: 0 })).value += value;
+  }
+
+  _lines() {
+    if (this.collect) this.collect(this);
+    return [...this.series.values()].map(s => `${this.name}${formatLabels(this.labelNames, s.labels)} ${s.value}`);
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, labelNames, buckets = LATENCY_BUCKETS) {
+    super('histogram', name, help, labelNames);
+    this.buckets = buckets;
+  }
+
+  observe(labels, value) {
+    const series = this._series(labels, () => ({ labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 }));
+    for (let i = 0; i < this.buckets.length; i++) {
+      if (value <= this.buckets[i]) {
+        series.counts[i] += 1;
+        break;
+      }
+    }
+    series.sum += value;
+    series.count += 1;
+  }
+
+  _lines() {
+    const lines = [];
+    for (const s of this.series.values()) {
+      let cumulative = 0;
+      for (let i = 0; i < this.buckets.length; i++) {
+        cumulative += s.counts[i];
+        lines.push(`${this.name}_bucket${formatLabels(this.labelNames, s.labels, `le="${this.buckets[i]}"`)} ${cumulative}`);
+      }
+      lines.push(`${this.name}_bucket${formatLabels(this.labelNames, s.labels, 'le="+Inf"')} ${s.count}`);
+      lines.push(`${this.name}_sum${formatLabels(this.labelNames, s.labels)} ${s.sum}`);
+      lines.push(`${this.name}_count${formatLabels(this.labelNames, s.labels)} ${s.count}`);
+    }
+    return lines;
+  }
+}
+
+class Registry {
+  constructor() {
+    this.metrics = [];
+  }
+
+  _add(metric) {
+    this.metrics.push(metric);
+    return metric;
+  }
+
+  counter(name, help, labelNames, collect) {
+    return this._add(new Scalar('counter', name, help, labelNames, collect));
+  }
+
+  gauge(name, help, labelNames, collect) {
+    return this._add(new Scalar('gauge', name, help, labelNames, collect));
+  }
+
+  histogram(name, help, labelNames, buckets) {
+    return this._add(new Histogram(name, help, labelNames, buckets));
+  }
+
+  render() {
+    return `${this.metrics.map(metric => metric.render()).join('\n')}\n`;
+  }
+}
+
+// Express middleware timing every request by its route pattern (not the raw
+// path, which would make a series per seat). Event streams are skipped, in
+// both the latency and the in-flight count, since they last as long as the
+// client's session (seat_stream_clients counts them). 5xx responses are
+// logged with their timing.
+function httpMetrics(registry) {
+  const duration = registry.histogram('http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route', 'status']);
+  const inFlight = registry.gauge('http_requests_in_flight', 'HTTP requests being served');
+
+  return (req, res, next) => {
+    const started = process.hrtime.bigint();
+    // EventSource always asks for an event stream
+    const counted = !String(req.get('Accept')).includes('text/event-stream');
+    if (counted) inFlight.inc([], 1);
+    res.on('close', () => {
+      if (counted) inFlight.inc([], -1);
+      if (String(res.getHeader('Content-Type')).startsWith('text/event-stream')) return;
+      const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+      // baseUrl is unset when a route's own middleware (e.g. its body parser) fails
+      const route = req.route ? (req.baseUrl || '') + req.route.path : 'unmatched';
+      duration.observe([req.method, route, res.statusCode], seconds);
+      if (res.statusCode >= 500) {
+        console.error(`${req.method} ${route} ${res.statusCode} in ${(seconds * 1000).toFixed(1)}ms`);
+      }
+    });
+    next();
+  };
+}
+
+// Number of documents a command returned or wrote, from its reply
+function documentCount(reply) {
+  if (!reply) return 0;
+  if (reply.cursor) return (reply.cursor.firstBatch || reply.cursor.nextBatch || []).length;
+  if (typeof reply.n === 'number') return reply.n;
+  return 0;
+}
+
+// Records every driver command (needs `monitorCommands: true` on connect)
+// and the connection pool's state. Pool events come from the MongoClient, so
+// call this right after mongoose.connect() to see the first connections.
+// Commands slower than `slowQueryMs` (0 = off) are logged with their filter.
+function instrumentMongo(connection, registry, { slowQueryMs = 0 } = {}) {
+  const duration = registry.histogram('mongodb_command_duration_seconds', 'MongoDB command latency', ['command', 'collection']);
+  const documents = registry.counter('mongodb_command_documents_total', 'Documents returned or written by MongoDB commands', ['command', 'collection']);
+  const failures = registry.counter('mongodb_command_failures_total', 'Failed MongoDB commands', ['command', 'collection']);
+  const checkoutWait = registry.histogram('mongodb_pool_checkout_seconds', 'Time waiting for a pooled connection', []);
+  const pool = { open: 0, inUse: 0, waiting: 0 };
+  registry.gauge('mongodb_pool_connections', 'Pooled MongoDB connections by state', ['state'], gauge => {
+    gauge.set(['open'], pool.open);
+    gauge.set(['in_use'], pool.inUse);
+    gauge.set(['waiting'], pool.waiting);
+    const max = connection.client && connection.client.options.maxPoolSize;
+    if (max) gauge.set(['max'], max);
+  });
+
+  const started = new Map(); // requestId -> { collection, filter }
+  connection.on('commandStarted', event => {
+    const collection = typeof event.command[event.commandName] === 'string' ? event.command[event.commandName] : '';
+    const entry = { collection };
+    if (slowQueryMs) entry.filter = event.command.filter || event.command.pipeline || event.command.updates || event.command.q;
+    started.set(event.requestId, entry);
+  });
+  connection.on('commandSucceeded', event => {
+    const entry = started.get(event.requestId) || { collection: '' };
+    started.delete(event.requestId);
+    const labels = [event.commandName, entry.collection];
+    const docs = documentCount(event.reply);
+    duration.observe(labels, event.duration / 1000);
+    documents.inc(labels, docs);
+    if (slowQueryMs && event.duration >= slowQueryMs) {
+      console.warn(`Slow query: ${event.commandName} ${entry.collection} ${event.duration}ms, ${docs} docs, ` +
+        `filter ${JSON.stringify(entry.filter || {}).slice(0, 500)}`);
+    }
+  });
+  connection.on('commandFailed', event => {
+    const entry = started.get(event.requestId) || { collection: '' };
+    started.delete(event.requestId);
+    failures.inc([event.commandName, entry.collection]);
+    duration.observe([event.commandName, entry.collection], event.duration / 1000);
+  });
+
+  const client = connection.client;
+  if (client) {
+    client.on('connectionCreated', () => { pool.open += 1; });
+    client.on('connectionClosed', () => { pool.open -= 1; });
+    client.on('connectionCheckOutStarted', () => { pool.waiting += 1; });
+    client.on('connectionCheckOutFailed', () => { pool.waiting -= 1; });
+    client.on('connectionCheckedOut', event => {
+      pool.waiting -= 1;
+      pool.inUse += 1;
+      if (event.durationMS !== undefined) checkoutWait.observe([], event.durationMS / 1000);
+    });
+    client.on('connectionCheckedIn', () => { pool.inUse -= 1; });
+  }
+}
+
+// Event-loop delay percentiles since the previous scrape, plus memory
+function processMetrics(registry) {
+  const delay = monitorEventLoopDelay({ resolution: 10 });
+  delay.enable();
+  registry.gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the last scrape', ['quantile'], gauge => {
+    gauge.set(['0.5'], delay.percentile(50) / 1e9);
+    gauge.set(['0.99'], delay.percentile(99) / 1e9);
+    gauge.set(['1'], delay.max / 1e9);
+    delay.reset();
+  });
+  registry.gauge('process_memory_bytes', 'Process memory', ['type'], gauge => {
+    const { rss, heapUsed, heapTotal } = process.memoryUsage();
+    gauge.set(['rss'], rss);
+    gauge.set(['heap_used'], heapUsed);
+    gauge.set(['heap_total'], heapTotal);
+  });
+}
+
+module.exports = { Registry, httpMetrics, instrumentMongo, processMetrics };
@@ -0,0 +1,88 @@
+const mongoose = require('mongoose');
+
+const SeatSchema = new mongoose.Schema({
+  room_id: String,
+  occupied: Number,
+  co2_ppm: Number,
+  temperature_c: Number,
+  building: String,
+  floor: Number,
+  accessible: Boolean,
+  capacity: Number,
+  // Time of the newest sensor reading applied (see readingBuffer.js)
+  updated_at: Date
+});
+
+// Sensor readings are upserted by room_id
+SeatSchema.index({ room_id: 1 }, { unique: true });
+// /api/seats/query shapes (see seatQuery.js): equality keys, then the
+// room_id sort, then the capacity range. One index for floor queries and one
+// for whole-building queries.
+const SEAT_QUERY_INDEXES = {
+  floor: { building: 1, floor: 1, occupied: 1, accessible: 1, room_id: 1, capacity: 1 },
+  building: { building: 1, occupied: 1, accessible: 1, room_id: 1, capacity: 1 }
+};
+SeatSchema.index(SEAT_QUERY_INDEXES.floor);
+SeatSchema.index(SEAT_QUERY_INDEXES.building);
+
+const Seat = mongoose.model('Seat', SeatSchema, 'OccupancyInfo');
+
+// Building layout plus live seat counts. `available`/`total` on the building
+// and on each floor are adjusted with $inc as seats change (see
+// availabilityCounters.js), so one find() serves every count on campus.
+const BuildingSchema = new mongoose.Schema({
+  name: { type: String, unique: true },
+  defaultFloor: Number,
+  floors: [{
+    _id: false,
+    floor: Number,
+    available: { type: Number, default: 0 },
+    total: { type: Number, default: 0 }
+  }],
+  available: { type: Number, default: 0 },
+  total: { type: Number, default: 0 }
+}, { versionKey: false });
+
+const Building = mongoose.model('Building', BuildingSchema, 'Buildings');
+
+// One document per occupancy change, stored as a time-series collection
+const OccupancyEventSchema = new mongoose.Schema({
+  ts: Date,
+  meta: {
+    room_id: String,
+    building: String,
+    floor: Number
+  },
+  occupied: Number
+}, {
+  timeseries: { timeField: 'ts', metaField: 'meta', granularity: 'minutes' },
+  versionKey: false
+});
+
+const OccupancyEvent = mongoose.model('OccupancyEvent', OccupancyEventSchema, 'OccupancyEvents');
+
+// Hourly and daily totals per room, floor and building, maintained as events
+// arrive. Times are in milliseconds:
+//   observed_ms  room-time with a known state
+//   occupied_ms  room-time spent occupied
+//   span_ms      wall-clock time covered (floor and building rows)
+//   peak         most rooms occupied at once
+const OccupancyRollupSchema = new mongoose.Schema({
+  level: { type: String, enum: ['room', 'floor', 'building'] },
+  key: String,
+  period: { type: String, enum: ['hour', 'day'] },
+  start: Date,
+  building: String,
+  floor: Number,
+  observed_ms: Number,
+  occupied_ms: Number,
+  span_ms: Number,
+  peak: Number
+}, { versionKey: false });
+
+OccupancyRollupSchema.index({ level: 1, key: 1, period: 1, start: 1 }, { unique: true });
+OccupancyRollupSchema.index({ level: 1, building: 1, floor: 1, period: 1, start: 1 });
+
+const OccupancyRollup = mongoose.model('OccupancyRollup', OccupancyRollupSchema, 'OccupancyRollups');
+
+module.exports = { Seat, SEAT_QUERY_INDEXES, Building, OccupancyEvent, OccupancyRollup };
@@ -0,0 +1,197 @@
+const { OccupancyEvent, OccupancyRollup } = require('./models');
+
+const PERIODS = { hour: 3600 * 1000, day: 24 * 3600 * 1000 };
+
+// Buckets are aligned to UTC
+function bucketStart(ts, period) {
+  return new Date(Math.floor(ts / PERIODS[period]) * PERIODS[period]);
+}
+
+// [level, key] pairs a room's time counts towards
+function groupsFor(room) {
+  const groups = [['room', room.room_id]];
+  if (room.building) {
+    groups.push(['building', room.building]);
+    if (room.floor !== undefined && room.floor !== null) {
+      groups.push(['floor', `${room.building}|${room.floor}`]);
+    }
+  }
+  return groups;
+}
+
+// Follows a SeatSnapshot, appends every occupancy change to OccupancyEvents
+// and keeps OccupancyRollups current. Each room's occupied/observed time is
+// accumulated in memory between changes; once a minute (`tickMs`) the totals
+// are written as one bulkWrite of $inc/$max upserts, so rollups never need
+// to be rebuilt from the raw events.
+//
+// Only one process should run this per database, or time is counted twice.
+class OccupancyHistory {
+  constructor(snapshot, { tickMs = 60 * 1000 } = {}) {
+    this.snapshot = snapshot;
+    this.tickMs = tickMs;
+    this.rooms = new Map(); // room_id -> { room_id, building, floor, occupied, since, occupied_ms, observed_ms }
+    this.occupiedNow = new Map(); // "level|key" -> rooms occupied right now
+    this.peaks = new Map(); // "level|key" -> highest occupiedNow since the last tick
+    this.events = [];
+    this.lastTick = Date.now();
+    this._seeded = false;
+    this._writing = null;
+    this._timer = null;
+
+    this._onChange = change => this._apply(change);
+    snapshot.on('change', this._onChange);
+  }
+
+  start() {
+    // First tick on the next whole minute so buckets split on the hour
+    const delay = this.tickMs - (Date.now() % this.tickMs);
+    this._timer = setTimeout(() => {
+      this._timer = setInterval(() => this.tick(), this.tickMs);
+      this._timer.unref();
+      this.tick();
+    }, delay);
+    this._timer.unref();
+  }
+
+  async stop() {
+    clearTimeout(this._timer);
+    clearInterval(this._timer);
+    this._timer = null;
+    this.snapshot.off('change', this._onChange);
+    if (this._writing) await this._writing;
+    await this.tick();
+  }
+
+  // Changes are placed at the reading's `updated_at` when the seat has one,
+  // clamped so time already credited is never credited again
+  _apply({ at, changed, removed }) {
+    for (const doc of changed) {
+      const occupied = doc.occupied === 1 ? 1 : 0;
+      const readAt = doc.updated_at ? Math.min(at, new Date(doc.updated_at).getTime()) : at;
+      let room = this.rooms.get(doc.room_id);
+      if (!room) {
+        room = { room_id: doc.room_id, building: doc.building, floor: doc.floor, occupied, since: at, occupied_ms: 0, observed_ms: 0 };
+        this.rooms.set(doc.room_id, room);
+        this._count(room, occupied);
+        // The first snapshot is the state we start from, not a change
+        if (this._seeded) this._event(room, readAt);
+        continue;
+      }
+      const t = Math.max(room.since, readAt);
+      this._close(room, t);
+      if (room.building !== doc.building || room.floor !== doc.floor) {
+        this._count(room, -room.occupied);
+        room.building = doc.building;
+        room.floor = doc.floor;
+        this._count(room, room.occupied);
+      }
+      if (room.occupied !== occupied) {
+        this._count(room, occupied - room.occupied);
+        room.occupied = occupied;
+        this._event(room, t);
+      }
+    }
+    for (const roomId of removed) {
+      const room = this.rooms.get(roomId);
+      if (!room) continue;
+      this._close(room, at);
+      this._count(room, -room.occupied);
+      this.rooms.delete(roomId);
+      // Time it accumulated since the last tick is dropped with it
+    }
+    this._seeded = true;
+  }
+
+  _close(room, t) {
+    const elapsed = t - room.since;
+    if (elapsed <= 0) return;
+    room.observed_ms += elapsed;
+    if (room.occupied) room.occupied_ms += elapsed;
+    room.since = t;
+  }
+
+  _count(room, delta) {
+    for (const [level, key] of groupsFor(room)) {
+      const id = `${level}|${key}`;
+      const now = (this.occupiedNow.get(id) || 0) + delta;
+      this.occupiedNow.set(id, now);
+      if (now > (this.peaks.get(id) || 0)) this.peaks.set(id, now);
+    }
+  }
+
+  _event(room, at) {
+    this.events.push({
+      ts: new Date(at),
+      meta: { room_id: room.room_id, building: room.building, floor: room.floor },
+      occupied: room.occupied
+    });
+  }
+
+  // Credits time up to now and writes it out. Skipped while the previous
+  // tick is still writing; its time is picked up by the next one.
+  tick() {
+    if (this._writing) return this._writing;
+    const now = Date.now();
+    const span = now - this.lastTick;
+    const start = this.lastTick;
+    this.lastTick = now;
+
+    const totals = new Map(); // "level|key" -> row
+    for (const room of this.rooms.values()) {
+      this._close(room, now);
+      for (const [level, key] of groupsFor(room)) {
+        const id = `${level}|${key}`;
+        let row = totals.get(id);
+        if (!row) {
+          row = { level, key, building: room.building, floor: level === 'building' ? undefined : room.floor, observed_ms: 0, occupied_ms: 0, span_ms: 0 };
+          totals.set(id, row);
+        }
+        row.observed_ms += room.observed_ms;
+        row.occupied_ms += room.occupied_ms;
+        row.span_ms = level === 'room' ? row.observed_ms : span;
+      }
+      room.observed_ms = 0;
+      room.occupied_ms = 0;
+    }
+
+    const ops = [];
+    for (const [id, row] of totals) {
+      const { level, key, building, floor, ...sums } = row;
+      for (const period of Object.keys(PERIODS)) {
+        ops.push({
+          updateOne: {
+            filter: { level, key, period, start: bucketStart(start, period) },
+            update: {
+              $inc: sums,
+              $max: { peak: this.peaks.get(id) || 0 },
+              $setOnInsert: { building, floor }
+            },
+            upsert: true
+          }
+        });
+      }
+    }
+    this.peaks = new Map(this.occupiedNow);
+
+    const events = this.events;
+    this.events = [];
+    this._writing = this._write(events, ops).finally(() => {
+      this._writing = null;
+    });
+    return this._writing;
+  }
+
+  async _write(events, ops) {
+    try {
+      await Promise.all([
+        events.length && OccupancyEvent.insertMany(events, { ordered: false, lean: true }),
+        ops.length && OccupancyRollup.bulkWrite(ops, { ordered: false })
+      ]);
+    } catch (err) {
+      console.error('Occupancy history write failed:', err.message);
+    }
+  }
+}
+
+module.exports = { OccupancyHistory, bucketStart, PERIODS };
@@ -0,0 +1,101 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { EventEmitter } = require('events');
+const { OccupancyEvent, OccupancyRollup } = require('./models');
+const { OccupancyHistory, bucketStart } = require('./occupancyHistory');
+
+const HOUR = 3600 * 1000;
+const T0 = Date.UTC(2024, 0, 1, 9);
+
+// Runs `history` against a clock the test moves, capturing what it writes
+function setup(t) {
+  let now = T0;
+  t.mock.method(Date, 'now', () => now);
+  const events = [];
+  const rollups = [];
+  t.mock.method(OccupancyEvent, 'insertMany', async docs => events.push(...docs));
+  t.mock.method(OccupancyRollup, 'bulkWrite', async ops => rollups.push(...ops));
+  const snapshot = new EventEmitter();
+  const history = new OccupancyHistory(snapshot);
+  const change = (changed, removed = []) => snapshot.emit('change', { at: now, changed, removed });
+  return { history, events, rollups, change, advance: ms => { now += ms; } };
+}
+
+// The hourly rollup row for one level|key
+function hourly(rollups, level, key) {
+  const op = rollups.find(({ updateOne: { filter } }) => filter.level === level && filter.key === key && filter.period === 'hour');
+  return op && op.updateOne;
+}
+
+const seat = (room_id, occupied, extra) => ({ room_id, building: 'Library', floor: 2, occupied, ...extra });
+
+test('a tick credits each room its observed and occupied time', async t => {
+  const { history, events, rollups, change, advance } = setup(t);
+  change([seat('a', 0), seat('b', 1)]);
+  advance(10 * 60 * 1000);
+  change([seat('a', 1)]);
+  advance(20 * 60 * 1000);
+
+  await history.tick();
+
+  const a = hourly(rollups, 'room', 'a');
+  assert.deepEqual(a.filter.start, bucketStart(T0, 'hour'));
+  assert.deepEqual(a.update.$inc, { observed_ms: 30 * 60 * 1000, occupied_ms: 20 * 60 * 1000, span_ms: 30 * 60 * 1000 });
+  assert.deepEqual(hourly(rollups, 'room', 'b').update.$inc, { observed_ms: 30 * 60 * 1000, occupied_ms: 30 * 60 * 1000, span_ms: 30 * 60 * 1000 });
+  assert.deepEqual(hourly(rollups, 'floor', 'Library|2').update, {
+    $inc: { observed_ms: 60 * 60 * 1000, occupied_ms: 50 * 60 * 1000, span_ms: 30 * 60 * 1000 },
+    $max: { peak: 2 },
+    $setOnInsert: { building: 'Library', floor: 2 }
+  });
+  assert.deepEqual(hourly(rollups, 'building', 'Library').update.$setOnInsert, { building: 'Library', floor: undefined });
+  // The first snapshot is the starting state, so only the change is an event
+  assert.deepEqual(events, [{ ts: new Date(T0 + 10 * 60 * 1000), meta: { room_id: 'a', building: 'Library', floor: 2 }, occupied: 1 }]);
+});
+
+test('time is never credited twice across ticks', async t => {
+  const { history, rollups, change, advance } = setup(t);
+  change([seat('a', 1)]);
+  advance(HOUR / 4);
+  await history.tick();
+  advance(HOUR / 4);
+  rollups.length = 0;
+
+  await history.tick();
+
+  assert.deepEqual(hourly(rollups, 'room', 'a').update.$inc, { observed_ms: HOUR / 4, occupied_ms: HOUR / 4, span_ms: HOUR / 4 });
+});
+
+test('changes are placed at the reading time, never before time already credited', async t => {
+  const { history, events, rollups, change, advance } = setup(t);
+  change([seat('a', 0)]);
+  advance(HOUR / 2);
+  await history.tick();
+  advance(HOUR / 4);
+  // The first change is placed at its reading time; the second was read
+  // before the first, so it is clamped to that time
+  change([seat('a', 1, { updated_at: new Date(T0 + HOUR / 2 + 5 * 60 * 1000) })]);
+  change([seat('a', 0, { updated_at: new Date(T0 + HOUR / 4) })]);
+  rollups.length = 0;
+
+  await history.tick();
+
+  assert.deepEqual(hourly(rollups, 'room', 'a').update.$inc, { observed_ms: HOUR / 4, occupied_ms: 0, span_ms: HOUR / 4 });
+  assert.deepEqual(events.map(event => [event.ts.getTime() - T0, event.occupied]), [
+    [HOUR / 2 + 5 * 60 * 1000, 1],
+    [HOUR / 2 + 5 * 60 * 1000, 0]
+  ]);
+});
+
+test('a removed room stops counting towards its floor', async t => {
+  const { history, rollups, change, advance } = setup(t);
+  change([seat('a', 1), seat('b', 1)]);
+  advance(HOUR / 4);
+  change([], ['b']);
+  advance(HOUR / 4);
+
+  await history.tick();
+
+  assert.equal(hourly(rollups, 'room', 'b'), undefined);
+  assert.deepEqual(hourly(rollups, 'floor', 'Library|2').update.$inc, { observed_ms: HOUR / 2, occupied_ms: HOUR / 2, span_ms: HOUR / 2 });
+  assert.equal(history.occupiedNow.get('floor|Library|2'), 1);
+});
@@ -0,0 +1,153 @@
+const { EventEmitter } = require('events');
+
+const READING_FIELDS = ['occupied', 'co2_ppm', 'temperature_c'];
+
+// How far ahead of this server a sensor's clock may run. A later `ts` would
+// be stored as `updated_at` and make every correct reading for that room look
+// stale until real time caught up.
+const MAX_CLOCK_SKEW_MS = 60 * 1000;
+
+// Validates one incoming reading. Returns null when it cannot be used.
+function normalizeReading(raw) {
+  if (!raw || typeof raw !== 'object') return null;
+  if (typeof raw.room_id !== 'string' || raw.room_id === '') return null;
+  const fields = {};
+  for (const field of READING_FIELDS) {
+    if (raw[field] === undefined || raw[field] === null) continue;
+    if (typeof raw[field] !== 'number' || !Number.isFinite(raw[field])) return null;
+    fields[field] = raw[field];
+  }
+  if (fields.occupied !== undefined && fields.occupied !== 0 && fields.occupied !== 1) return null;
+  if (Object.keys(fields).length === 0) return null;
+  const now = Date.now();
+  if (raw.ts === null) return null;
+  const ts = raw.ts === undefined ? now : new Date(raw.ts).getTime();
+  if (Number.isNaN(ts) || ts > now + MAX_CLOCK_SKEW_MS) return null;
+  return { room_id: raw.room_id, ts, fields };
+}
+
+// Collects sensor readings and writes them to `model` in batches. Readings
+// for the same room that arrive before the next flush are merged (newest
+// `ts` wins per field), so each flush is one unordered bulkWrite with at most
+// one upsert per room, and at most `maxBatch` rooms. Only one flush runs at a
+// time. At most `maxPending` rooms wait; addAll() refuses readings that would
+// go past that, and `full` tells callers to shed load.
+//
+// The reading time is stored as `updated_at` and a write only applies when it
+// is newer than the stored one, so a late or retried reading never
+// overwrites newer state.
+class ReadingBuffer extends EventEmitter {
+  constructor(model, { flushMs = 250, maxBatch = 1000, maxPending = 20000 } = {}) {
+    super();
+    this.model = model;
+    this.flushMs = flushMs;
+    this.maxBatch = maxBatch;
+    this.maxPending = maxPending;
+    this.pending = new Map(); // room_id -> { ts, fields }
+    this.stats = { received: 0, coalesced: 0, written: 0, stale: 0, failed: 0, flushes: 0, lastFlushMs: 0 };
+    this._flushing = null;
+    this._timer = null;
+  }
+
+  get full() {
+    return this.pending.size >= this.maxPending;
+  }
+
+  start() {
+    this._timer = setInterval(() => this.flush(), this.flushMs);
+    this._timer.unref();
+  }
+
+  async stop() {
+    clearInterval(this._timer);
+    this._timer = null;
+    while (this._flushing || this.pending.size > 0) await this.flush();
+  }
+
+  // Adds all of `readings`, or none (returning false) if the rooms they add
+  // would take the queue past `maxPending`
+  addAll(readings) {
+    const rooms = new Set();
+    for (const reading of readings) {
+      if (!this.pending.has(reading.room_id)) rooms.add(reading.room_id);
+    }
+    if (this.pending.size + rooms.size > this.maxPending) return false;
+    for (const reading of readings) this.add(reading);
+    return true;
+  }
+
+  add(reading) {
+    this.stats.received += 1;
+    const entry = this.pending.get(reading.room_id);
+    if (!entry) {
+      this.pending.set(reading.room_id, { ts: reading.ts, fields: { ...reading.fields } });
+    } else {
+      this.stats.coalesced += 1;
+      if (reading.ts >= entry.ts) {
+        Object.assign(entry.fields, reading.fields);
+        entry.ts = reading.ts;
+      } else {
+        entry.fields = { ...reading.fields, ...entry.fields };
+      }
+    }
+    if (this.pending.size >= this.maxBatch && !this._flushing) this.flush();
+  }
+
+  // Writes up to `maxBatch` rooms; a longer backlog is written in further
+  // batches straight after
+  flush() {
+    if (this._flushing) return this._flushing;
+    if (this.pending.size === 0) return Promise.resolve();
+    let batch = this.pending;
+    if (batch.size <= this.maxBatch) {
+      this.pending = new Map();
+    } else {
+      batch = new Map();
+      for (const [roomId, entry] of this.pending) {
+        batch.set(roomId, entry);
+        this.pending.delete(roomId);
+        if (batch.size === this.maxBatch) break;
+      }
+    }
+    this._flushing = this._write(batch).finally(() => {
+      this._flushing = null;
+      if (this.pending.size >= this.maxBatch) this.flush();
+    });
+    return this._flushing;
+  }
+
+  async _write(batch) {
+    const ops = [];
+    for (const [roomId, { ts, fields }] of batch) {
+      const updatedAt = new Date(ts);
+      ops.push({
+        updateOne: {
+          // When the stored reading is newer the filter misses and the upsert
+          // fails on the unique room_id; that is counted as stale
+          filter: { room_id: roomId, $or: [{ updated_at: { $lt: updatedAt } }, { updated_at: null }] },
+          update: { $set: { ...fields, updated_at: updatedAt } },
+          upsert: true
+        }
+      });
+    }
+    const started = Date.now();
+    try {
+      await this.model.bulkWrite(ops, { ordered: false });
+      this.stats.written += ops.length;
+    } catch (err) {
+      const errors = err.writeErrors || [];
+      const stale = errors.filter(e => e.code === 11000).length;
+      // A dropped room is corrected by that sensor's next report
+      const failed = err.writeErrors ? errors.length - stale : ops.length;
+      this.stats.written += ops.length - failed - stale;
+      this.stats.stale += stale;
+      this.stats.failed += failed;
+      if (failed) console.error(`Reading flush failed for ${failed} of ${ops.length} rooms:`, err.message);
+    }
+    this.stats.flushes += 1;
+    this.stats.lastFlushMs = Date.now() - started;
+    this.emit('flush', { rooms: ops.length, ms: this.stats.lastFlushMs, batch });
+  }
+}
+
+module.exports = { ReadingBuffer, normalizeReading, MAX_CLOCK_SKEW_MS };
@@ -0,0 +1,109 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { ReadingBuffer, normalizeReading, MAX_CLOCK_SKEW_MS } = require('./readingBuffer');
+
+// Records each bulkWrite; `fail` can reject one with a driver-style error
+function fakeModel() {
+  const model = {
+    writes: [],
+    fail: null,
+    async bulkWrite(ops) {
+      model.writes.push(ops);
+      if (model.fail) throw model.fail;
+    }
+  };
+  return model;
+}
+
+const reading = (room_id, ts, fields) => ({ room_id, ts, fields });
+
+test('normalizeReading keeps known numeric fields and the reading time', () => {
+  assert.deepEqual(
+    normalizeReading({ room_id: 'A-101', occupied: 1, co2_ppm: 640, extra: 'x', ts: '2024-01-01T00:00:00Z' }),
+    { room_id: 'A-101', ts: Date.parse('2024-01-01T00:00:00Z'), fields: { occupied: 1, co2_ppm: 640 } }
+  );
+});
+
+test('normalizeReading rejects unusable readings', () => {
+  for (const raw of [
+    null,
+    'A-101',
+    { occupied: 1 },
+    { room_id: '', occupied: 1 },
+    { room_id: 'A-101' },
+    { room_id: 'A-101', occupied: 2 },
+    { room_id: 'A-101', co2_ppm: '640' },
+    { room_id: 'A-101', temperature_c: Infinity },
+    { room_id: 'A-101', occupied: 0, ts: 'not a date' },
+    { room_id: 'A-101', occupied: 0, ts: null }
+  ]) {
+    assert.equal(normalizeReading(raw), null, JSON.stringify(raw));
+  }
+});
+
+test('normalizeReading rejects readings from clocks too far ahead', t => {
+  const now = Date.UTC(2024, 0, 1);
+  t.mock.method(Date, 'now', () => now);
+  assert.equal(normalizeReading({ room_id: 'A-101', occupied: 1, ts: now + MAX_CLOCK_SKEW_MS }).ts, now + MAX_CLOCK_SKEW_MS);
+  assert.equal(normalizeReading({ room_id: 'A-101', occupied: 1, ts: now + MAX_CLOCK_SKEW_MS + 1 }), null);
+  assert.equal(normalizeReading({ room_id: 'A-101', occupied: 1 }).ts, now);
+});
+
+test('readings for one room are merged, newest reading winning per field', async () => {
+  const model = fakeModel();
+  const buffer = new ReadingBuffer(model);
+  buffer.add(reading('A-101', 2000, { occupied: 1, co2_ppm: 700 }));
+  buffer.add(reading('A-101', 1000, { occupied: 0, temperature_c: 21 }));
+  buffer.add(reading('A-101', 3000, { co2_ppm: 800 }));
+
+  await buffer.flush();
+
+  assert.equal(model.writes.length, 1);
+  const [{ updateOne }] = model.writes[0];
+  assert.deepEqual(updateOne.update, {
+    $set: { occupied: 1, co2_ppm: 800, temperature_c: 21, updated_at: new Date(3000) }
+  });
+  assert.deepEqual(updateOne.filter, {
+    room_id: 'A-101',
+    $or: [{ updated_at: { $lt: new Date(3000) } }, { updated_at: null }]
+  });
+  assert.equal(updateOne.upsert, true);
+  assert.equal(buffer.stats.coalesced, 2);
+  assert.equal(buffer.stats.written, 1);
+});
+
+test('addAll accepts all of a batch or none of it', () => {
+  const buffer = new ReadingBuffer(fakeModel(), { maxPending: 2 });
+  assert.equal(buffer.addAll([reading('a', 1, { occupied: 1 })]), true);
+  assert.equal(buffer.addAll([reading('a', 2, { occupied: 0 }), reading('b', 2, { occupied: 1 }), reading('c', 2, { occupied: 1 })]), false);
+  assert.deepEqual([...buffer.pending.keys()], ['a']);
+  assert.equal(buffer.addAll([reading('a', 3, { occupied: 0 }), reading('b', 3, { occupied: 1 })]), true);
+  assert.equal(buffer.full, true);
+});
+
+test('flushes write at most maxBatch rooms each', async () => {
+  const model = fakeModel();
+  const buffer = new ReadingBuffer(model, { maxBatch: 2 });
+  buffer.addAll(['a', 'b', 'c', 'd', 'e'].map(roomId => reading(roomId, 1, { occupied: 1 })));
+
+  await buffer.stop();
+
+  assert.deepEqual(model.writes.map(ops => ops.length), [2, 2, 1]);
+  assert.equal(buffer.stats.written, 5);
+});
+
+test('duplicate key errors count as stale, other write errors as failed', async () => {
+  const model = fakeModel();
+  const buffer = new ReadingBuffer(model);
+  model.fail = Object.assign(new Error('write errors'), { writeErrors: [{ code: 11000 }, { code: 11000 }, { code: 2 }] });
+  buffer.addAll(['a', 'b', 'c', 'd'].map(roomId => reading(roomId, 1, { occupied: 1 })));
+  const log = test.mock.method(console, 'error', () => {});
+
+  await buffer.flush();
+
+  assert.equal(log.mock.callCount(), 1);
+  assert.deepEqual(
+    { written: buffer.stats.written, stale: buffer.stats.stale, failed: buffer.stats.failed },
+    { written: 1, stale: 2, failed: 1 }
+  );
+});
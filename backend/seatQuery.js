@@ -0,0 +1,60 @@
+const { Seat, SEAT_QUERY_INDEXES } = require('./models');
+
+const MAX_LIMIT = 200;
+const PROJECTION = { _id: 0, room_id: 1, building: 1, floor: 1, occupied: 1, accessible: 1, capacity: 1, updated_at: 1 };
+
+class QueryError extends Error {}
+
+function flag(value) {
+  return value === '1' || value === 'true';
+}
+
+function encodeCursor(roomId) {
+  return Buffer.from(roomId).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+  return Buffer.from(cursor, 'base64url').toString();
+}
+
+// Turns /api/seats/query parameters into a filter that always matches one of
+// the two compound indexes on OccupancyInfo. Filters the caller leaves open
+// on `occupied` and `accessible` become $in over every value (missing
+// included), so the index prefix stays intact and Mongo merges the ranges in
+// room_id order instead of sorting in memory. The index is hinted so the
+// planner cannot settle on the room_id index and walk the whole campus.
+function buildSeatQuery(params) {
+  if (typeof params.building !== 'string' || params.building === '') {
+    throw new QueryError('building is required');
+  }
+  const filter = { building: params.building };
+  if (params.floor !== undefined) {
+    const floor = Number(params.floor);
+    if (!Number.isInteger(floor)) throw new QueryError('floor must be an integer');
+    filter.floor = floor;
+  }
+  filter.occupied = flag(params.available) ? 0 : { $in: [0, 1, null] };
+  filter.accessible = flag(params.accessible) ? true : { $in: [true, false, null] };
+  if (params.cursor !== undefined) filter.room_id = { $gt: decodeCursor(String(params.cursor)) };
+  const partySize = params.partySize === undefined ? 1 : Number(params.partySize);
+  if (!Number.isInteger(partySize) || partySize < 1) throw new QueryError('partySize must be a positive integer');
+  if (partySize > 1) filter.capacity = { $gte: partySize };
+
+  const limit = params.limit === undefined ? 50 : Number(params.limit);
+  if (!Number.isInteger(limit) || limit < 1 || limit > MAX_LIMIT) {
+    throw new QueryError(`limit must be between 1 and ${MAX_LIMIT}`);
+  }
+  const hint = filter.floor === undefined ? SEAT_QUERY_INDEXES.building : SEAT_QUERY_INDEXES.floor;
+  return { filter, sort: { room_id: 1 }, projection: PROJECTION, limit, hint };
+}
+
+// One page of seats plus the cursor for the next one (null on the last page)
+async function findSeats(params) {
+  const { filter, sort, projection, limit, hint } = buildSeatQuery(params);
+  const seats = await Seat.find(filter, projection).sort(sort).hint(hint).limit(limit + 1).lean();
+  const more = seats.length > limit;
+  if (more) seats.pop();
+  return { seats, nextCursor: more ? encodeCursor(seats[seats.length - 1].room_id) : null };
+}
+
+module.exports = { buildSeatQuery, findSeats, QueryError };
@@ -0,0 +1,49 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { SEAT_QUERY_INDEXES } = require('./models');
+const { buildSeatQuery, QueryError } = require('./seatQuery');
+
+test('open filters become $in over every value so the index prefix holds', () => {
+  const { filter, sort, limit, hint } = buildSeatQuery({ building: 'Library' });
+  assert.deepEqual(filter, {
+    building: 'Library',
+    occupied: { $in: [0, 1, null] },
+    accessible: { $in: [true, false, null] }
+  });
+  assert.deepEqual(sort, { room_id: 1 });
+  assert.equal(limit, 50);
+  assert.equal(hint, SEAT_QUERY_INDEXES.building);
+});
+
+test('every parameter narrows the filter', () => {
+  const cursor = Buffer.from('LIB-210').toString('base64url');
+  const { filter, limit, hint } = buildSeatQuery({
+    building: 'Library', floor: '2', available: '1', accessible: 'true', partySize: '4', limit: '10', cursor
+  });
+  assert.deepEqual(filter, {
+    building: 'Library',
+    floor: 2,
+    occupied: 0,
+    accessible: true,
+    room_id: { $gt: 'LIB-210' },
+    capacity: { $gte: 4 }
+  });
+  assert.equal(limit, 10);
+  assert.equal(hint, SEAT_QUERY_INDEXES.floor);
+});
+
+test('invalid parameters are rejected with a QueryError', () => {
+  for (const params of [
+    {},
+    { building: '' },
+    { building: ['Library', 'Annex'] },
+    { building: 'Library', floor: '1.5' },
+    { building: 'Library', floor: 'two' },
+    { building: 'Library', partySize: '0' },
+    { building: 'Library', partySize: 'many' },
+    { building: 'Library', limit: '0' },
+    { building: 'Library', limit: '201' }
+  ]) {
+    assert.throws(() => buildSeatQuery(params), QueryError, JSON.stringify(params));
+  }
+});
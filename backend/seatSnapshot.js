@@ -0,0 +1,237 @@
+const crypto = require('crypto');
+const { EventEmitter } = require('events');
+
+// Cluster times as BigInts so they compare and serialize simply
+function toPosition(timestamp) {
+  return (BigInt(timestamp.t) << 32n) | BigInt(timestamp.i);
+}
+
+// In-process copy of the OccupancyInfo collection. GET /api/seats is served
+// from `body` so repeat hits never reach Mongo. Each observed change bumps
+// `version`; the ETag is derived from the body so it is the same on every
+// process holding the same data.
+//
+// The collection is read in full once at start. After that each change
+// stream event patches the one document it names, so a change costs
+// O(changed seats); `body` and `etag` are rebuilt only when next requested.
+// While following a change stream `position` is the cluster time of the last
+// change applied, which means the same thing on every process. Without a
+// change stream (standalone server, or after a stream error) the collection
+// is reloaded every `pollMs` and `position` is null.
+class SeatSnapshot extends EventEmitter {
+  constructor(model, { pollMs = 2000 } = {}) {
+    super();
+    this.model = model;
+    this.pollMs = pollMs;
+    this.version = 0;
+    this.position = null;
+    this.seats = new Map(); // room_id -> lean document
+    this.json = new Map(); // room_id -> serialized document, in room_id order
+    this.ids = new Map(); // String(_id) -> room_id, to resolve deletes
+    this.updatedAt = null;
+    this.ready = false;
+    this._body = null;
+    this._etag = null;
+    this._sorted = true;
+    this._queue = []; // change events waiting to be applied
+    this._refreshing = null;
+    this._pending = false;
+    this._stream = null;
+    this._timer = null;
+  }
+
+  async start() {
+    // Changes from here on are replayed by the stream, so none can slip in
+    // between the initial load and the stream opening
+    const startAt = await this._operationTime();
+    if (startAt) this.position = toPosition(startAt);
+    await this.refresh();
+    this._watch(startAt);
+  }
+
+  stop() {
+    if (this._timer) clearInterval(this._timer);
+    this._timer = null;
+    if (this._stream) this._stream.close().catch(() => {});
+    this._stream = null;
+    this._queue = [];
+  }
+
+  get body() {
+    this._build();
+    return this._body;
+  }
+
+  get etag() {
+    this._build();
+    return this._etag;
+  }
+
+  _build() {
+    if (this._body) return;
+    if (!this._sorted) {
+      this.json = new Map([...this.json].sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0)));
+      this._sorted = true;
+    }
+    this._body = Buffer.from(`[${Array.from(this.json.values()).join(',')}]`);
+    this._etag = `"${crypto.createHash('sha1').update(this._body).digest('base64url')}"`;
+  }
+
+  // Reloads the collection. Calls made while a load is running are folded
+  // into a single follow-up load, so a burst of changes costs two queries.
+  refresh() {
+    if (this._refreshing) {
+      this._pending = true;
+      return this._refreshing;
+    }
+    this._refreshing = this._load().finally(() => {
+      this._refreshing = null;
+      if (this._pending) {
+        this._pending = false;
+        this._refreshInBackground();
+      }
+    });
+    return this._refreshing;
+  }
+
+  _refreshInBackground() {
+    this.refresh().catch(err => console.error('Seat snapshot refresh failed:', err.message));
+  }
+
+  // Cluster time to open the change stream at; null on a standalone server
+  async _operationTime() {
+    try {
+      const reply = await this.model.db.db.command({ ping: 1 });
+      return reply.operationTime || null;
+    } catch (err) {
+      return null;
+    }
+  }
+
+  // Change streams need a replica set; a standalone server (or one that drops
+  // the stream later) falls back to a fixed-interval poll.
+  _watch(startAt) {
+    const options = { fullDocument: 'updateLookup' };
+    if (startAt) options.startAtOperationTime = startAt;
+    try {
+      this._stream = this.model.watch([], options);
+    } catch (err) {
+      return this._poll(err);
+    }
+    this._stream.on('change', event => this._enqueue(event));
+    this._stream.on('error', err => this._streamFailed(err));
+  }
+
+  _streamFailed(err) {
+    if (this._stream) this._stream.close().catch(() => {});
+    this._stream = null;
+    // Events may have been missed, so start over from a full read
+    this._queue = [];
+    this.position = null;
+    this._poll(err);
+    this._refreshInBackground();
+  }
+
+  _poll(reason) {
+    if (this._timer) return;
+    console.log(`Seat snapshot polling every ${this.pollMs}ms (${reason.message})`);
+    this._timer = setInterval(() => this._refreshInBackground(), this.pollMs);
+    this._timer.unref();
+  }
+
+  // Events arriving together (one ingestion flush) become one version
+  _enqueue(event) {
+    this._queue.push(event);
+    if (this._queue.length === 1) setImmediate(() => this._applyQueued());
+  }
+
+  _applyQueued() {
+    const events = this._queue;
+    this._queue = [];
+    const changed = new Map(); // room_id -> doc
+    const removed = new Set();
+    let failure = null;
+    for (const event of events) {
+      const id = String(event.documentKey && event.documentKey._id);
+      const previous = this.ids.get(id);
+      if (event.operationType === 'delete') {
+        if (previous !== undefined) this._remove(id, previous, changed, removed);
+      } else if (['insert', 'update', 'replace'].includes(event.operationType)) {
+        // A null lookup means the document is already gone; its delete follows
+        const doc = event.fullDocument;
+        if (doc) {
+          if (previous !== undefined && previous !== doc.room_id) this._remove(id, previous, changed, removed);
+          this._put(id, doc, changed, removed);
+        }
+      } else {
+        // drop, rename or invalidate: the stream is no longer usable
+        failure = new Error(`change stream ${event.operationType}`);
+        break;
+      }
+      if (event.clusterTime) this.position = toPosition(event.clusterTime);
+    }
+    // Changes already applied are published first; the reload that follows
+    // compares against them, so it would not report them again
+    if (changed.size || removed.size) this._publish([...changed.values()], [...removed]);
+    if (failure) this._streamFailed(failure);
+  }
+
+  _put(id, doc, changed, removed) {
+    delete doc.__v;
+    doc._id = id;
+    const serialized = JSON.stringify(doc);
+    if (this.json.get(doc.room_id) === serialized) return;
+    if (!this.json.has(doc.room_id)) this._sorted = false;
+    this.seats.set(doc.room_id, doc);
+    this.json.set(doc.room_id, serialized);
+    this.ids.set(id, doc.room_id);
+    changed.set(doc.room_id, doc);
+    removed.delete(doc.room_id);
+  }
+
+  _remove(id, roomId, changed, removed) {
+    this.ids.delete(id);
+    if (!this.seats.delete(roomId)) return;
+    this.json.delete(roomId);
+    changed.delete(roomId);
+    removed.add(roomId);
+  }
+
+  async _load() {
+    const docs = await this.model.find({}, { __v: 0 }).sort({ room_id: 1 }).lean();
+    const seats = new Map();
+    const json = new Map();
+    const ids = new Map();
+    const changed = [];
+    for (const doc of docs) {
+      doc._id = String(doc._id);
+      const serialized = JSON.stringify(doc);
+      if (this.json.get(doc.room_id) !== serialized) changed.push(doc);
+      seats.set(doc.room_id, doc);
+      json.set(doc.room_id, serialized);
+      ids.set(doc._id, doc.room_id);
+    }
+    const removed = [];
+    for (const roomId of this.seats.keys()) {
+      if (!seats.has(roomId)) removed.push(roomId);
+    }
+    this.ids = ids;
+    if (this.ready && changed.length === 0 && removed.length === 0) return;
+
+    this.seats = seats;
+    this.json = json;
+    this._sorted = true;
+    this._publish(changed, removed);
+  }
+
+  _publish(changed, removed) {
+    this._body = null;
+    this._etag = null;
+    this.version += 1;
+    this.updatedAt = Date.now();
+    this.ready = true;
+    this.emit('change', { version: this.version, position: this.position, at: this.updatedAt, changed, removed });
+  }
+}
+
+module.exports = { SeatSnapshot };
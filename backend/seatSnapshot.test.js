@@ -0,0 +1,141 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { EventEmitter } = require('events');
+const { SeatSnapshot } = require('./seatSnapshot');
+
+// A collection of `docs` with a change stream the test drives by hand
+function fakeModel(docs) {
+  const model = {
+    docs,
+    finds: 0,
+    stream: null,
+    db: { db: { command: async () => ({ operationTime: { t: 100, i: 0 } }) } },
+    // Only the { __v: 0 } projection SeatSnapshot uses is supported
+    find() {
+      model.finds += 1;
+      const copy = ({ __v, ...doc }) => doc;
+      return { sort: () => ({ lean: async () => model.docs.map(copy) }) };
+    },
+    watch() {
+      model.stream = Object.assign(new EventEmitter(), { close: async () => {} });
+      return model.stream;
+    }
+  };
+  return model;
+}
+
+const seat = (id, room_id, occupied) => ({ _id: id, room_id, occupied, __v: 0 });
+
+const event = (operationType, id, fullDocument, t) => ({
+  operationType,
+  documentKey: { _id: id },
+  fullDocument,
+  clusterTime: { t, i: 1 }
+});
+
+async function start(t, docs) {
+  const model = fakeModel(docs);
+  const snapshot = new SeatSnapshot(model);
+  t.after(() => snapshot.stop());
+  await snapshot.start();
+  const changes = [];
+  snapshot.on('change', change => changes.push(change));
+  return { model, snapshot, changes };
+}
+
+// Lets queued change events apply, and any reload they trigger finish
+async function settle(snapshot) {
+  await new Promise(resolve => setImmediate(resolve));
+  if (snapshot._refreshing) await snapshot._refreshing;
+}
+
+// ETag of a snapshot loaded fresh from the same documents
+async function freshEtag(docs) {
+  const snapshot = new SeatSnapshot(fakeModel(docs));
+  await snapshot.refresh();
+  return snapshot.etag;
+}
+
+test('start loads once and opens the stream at the load position', async t => {
+  const { model, snapshot } = await start(t, [seat('1', 'A-101', 0), seat('2', 'A-102', 1)]);
+
+  assert.equal(model.finds, 1);
+  assert.equal(snapshot.ready, true);
+  assert.equal(snapshot.version, 1);
+  assert.equal(snapshot.position, 100n << 32n);
+  assert.deepEqual(JSON.parse(snapshot.body), [
+    { _id: '1', room_id: 'A-101', occupied: 0 },
+    { _id: '2', room_id: 'A-102', occupied: 1 }
+  ]);
+});
+
+test('an update patches its seat without a reload and rebuilds the body lazily', async t => {
+  const { model, snapshot, changes } = await start(t, [seat('1', 'A-101', 0), seat('2', 'A-102', 1)]);
+  const etag = snapshot.etag;
+
+  model.stream.emit('change', event('update', '1', seat('1', 'A-101', 1), 101));
+  await settle(snapshot);
+
+  assert.equal(model.finds, 1);
+  assert.equal(changes.length, 1);
+  assert.deepEqual(changes[0].changed, [{ _id: '1', room_id: 'A-101', occupied: 1 }]);
+  assert.deepEqual(changes[0].removed, []);
+  assert.equal(changes[0].position, (101n << 32n) | 1n);
+  assert.equal(snapshot._body, null);
+  assert.notEqual(snapshot.etag, etag);
+  assert.equal(snapshot.etag, await freshEtag([seat('1', 'A-101', 1), seat('2', 'A-102', 1)]));
+});
+
+test('events arriving together become one version and repeats are dropped', async t => {
+  const { model, snapshot, changes } = await start(t, [seat('1', 'A-101', 0)]);
+
+  model.stream.emit('change', event('update', '1', seat('1', 'A-101', 1), 101));
+  model.stream.emit('change', event('update', '1', seat('1', 'A-101', 1), 101));
+  await settle(snapshot);
+  model.stream.emit('change', event('update', '1', seat('1', 'A-101', 1), 102));
+  await settle(snapshot);
+
+  assert.equal(changes.length, 1);
+  assert.equal(snapshot.version, 2);
+  assert.equal(snapshot.position, (102n << 32n) | 1n);
+});
+
+test('a delete removes the seat', async t => {
+  const { model, snapshot, changes } = await start(t, [seat('1', 'A-101', 0), seat('2', 'A-102', 1)]);
+
+  model.stream.emit('change', event('delete', '2', undefined, 101));
+  await settle(snapshot);
+
+  assert.deepEqual(changes.map(({ changed, removed }) => ({ changed, removed })), [{ changed: [], removed: ['A-102'] }]);
+  assert.deepEqual(JSON.parse(snapshot.body).map(doc => doc.room_id), ['A-101']);
+  assert.equal(snapshot.ids.has('2'), false);
+});
+
+test('a room_id change removes the old room and adds the new one in order', async t => {
+  const { model, snapshot, changes } = await start(t, [seat('1', 'A-101', 0), seat('2', 'A-103', 1)]);
+
+  model.stream.emit('change', event('update', '2', seat('2', 'A-100', 1), 101));
+  await settle(snapshot);
+
+  assert.deepEqual(changes[0].removed, ['A-103']);
+  assert.deepEqual(changes[0].changed.map(doc => doc.room_id), ['A-100']);
+  assert.deepEqual(JSON.parse(snapshot.body).map(doc => doc.room_id), ['A-100', 'A-101']);
+  assert.equal(snapshot.etag, await freshEtag([seat('2', 'A-100', 1), seat('1', 'A-101', 0)]));
+});
+
+test('changes before an invalidate are published before falling back to polling', async t => {
+  const { model, snapshot, changes } = await start(t, [seat('1', 'A-101', 0)]);
+  t.mock.method(console, 'log', () => {});
+  model.docs = [seat('1', 'A-101', 1)];
+
+  model.stream.emit('change', event('update', '1', seat('1', 'A-101', 1), 101));
+  model.stream.emit('change', { operationType: 'invalidate', clusterTime: { t: 102, i: 0 } });
+  await settle(snapshot);
+
+  assert.equal(changes.length, 1);
+  assert.deepEqual(changes[0].changed, [{ _id: '1', room_id: 'A-101', occupied: 1 }]);
+  assert.equal(model.finds, 2);
+  assert.equal(snapshot.position, null);
+  assert.equal(snapshot._stream, null);
+  assert.deepEqual(JSON.parse(snapshot.body), [{ _id: '1', room_id: 'A-101', occupied: 1 }]);
+});
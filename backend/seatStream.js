@@ -0,0 +1,167 @@
+const crypto = require('crypto');
+
+const DELTA_FIELDS = ['room_id', 'occupied', 'co2_ppm', 'temperature_c', 'updated_at'];
+
+// Server-sent events on top of a SeatSnapshot: a `delta` event per snapshot
+// version carrying only the rooms that changed.
+//
+// While the snapshot follows a change stream, event ids are `t<position>`,
+// the cluster time of the change, which means the same thing on every
+// process. A reconnect (or a /api/seats/query `streamId`) landing on any
+// process is caught up with the deltas after that position if they are still
+// retained; if the client is ahead of this process, frames it has already
+// seen are skipped. Without a change stream ids are `<epoch>-<version>` and
+// only resume on the process that issued them. Anything else gets a small
+// `reset` event, telling the client to re-read what it shows; the full-campus
+// `snapshot` event is only sent to clients that ask with `?snapshot=1`.
+//
+// Every frame is serialized once and written to all clients. A frame that
+// would take a client's socket buffer past `maxBufferedBytes` drops the
+// client, which is left to resume.
+class SeatStream {
+  constructor(snapshot, { historySize = 256, heartbeatMs = 15000, maxBufferedBytes = 1 << 20 } = {}) {
+    this.snapshot = snapshot;
+    this.historySize = historySize;
+    this.maxBufferedBytes = maxBufferedBytes;
+    this.epoch = crypto.randomBytes(4).toString('hex');
+    this.clients = new Set();
+    this.history = []; // [{ version, position, frame }], oldest first
+    // Every change after this position is in `history`; null when unknown
+    this._base = snapshot.ready ? snapshot.position : null;
+    this._snapshotFrame = null;
+    this._snapshotVersion = -1;
+
+    this._onChange = change => this._broadcast(change);
+    snapshot.on('change', this._onChange);
+    this._heartbeat = setInterval(() => this._write(': ping\n\n'), heartbeatMs);
+    this._heartbeat.unref();
+  }
+
+  close() {
+    clearInterval(this._heartbeat);
+    this.snapshot.off('change', this._onChange);
+    for (const client of this.clients) client.res.end();
+    this.clients.clear();
+  }
+
+  // Event id for the snapshot's current version
+  currentId() {
+    return this._id(this.snapshot.version, this.snapshot.position);
+  }
+
+  _id(version, position) {
+    return position === null ? `${this.epoch}-${version}` : `t${position}`;
+  }
+
+  handle(req, res) {
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
+    });
+    res.flushHeaders();
+    req.socket.setNoDelay(true);
+
+    // `after`: the position the client has already seen, if ahead of us
+    const client = { res, synced: false, after: null, snapshot: req.query.snapshot === '1' };
+    this.clients.add(client);
+    req.on('close', () => this.clients.delete(client));
+
+    if (!this.snapshot.ready) return;
+    const catchUp = this._since(req.get('Last-Event-ID') || req.query.since, client);
+    if (catchUp) {
+      for (const frame of catchUp) this._send(client, frame);
+      client.synced = true;
+    } else {
+      this._resync(client);
+    }
+  }
+
+  // Frames after the given event id, or null when the id cannot be resumed.
+  _since(lastEventId, client) {
+    if (typeof lastEventId !== 'string') return null;
+    if (/^t\d+$/.test(lastEventId)) return this._sincePosition(BigInt(lastEventId.slice(1)), client);
+    const [epoch, rawVersion] = lastEventId.split('-');
+    const version = Number(rawVersion);
+    if (epoch !== this.epoch || !Number.isInteger(version)) return null;
+    if (version > this.snapshot.version) return null;
+    if (version === this.snapshot.version) return [];
+    const oldest = this.history.length ? this.history[0].version : Infinity;
+    if (version + 1 < oldest) return null;
+    return this.history.filter(entry => entry.version > version).map(entry => entry.frame);
+  }
+
+  _sincePosition(position, client) {
+    const current = this.snapshot.position;
+    if (current === null || this._base === null || position < this._base) return null;
+    if (position >= current) {
+      client.after = position;
+      return [];
+    }
+    return this.history.filter(entry => entry.position > position).map(entry => entry.frame);
+  }
+
+  _broadcast({ version, position = null, at, changed, removed }) {
+    const seats = changed.map(doc => {
+      const delta = {};
+      for (const field of DELTA_FIELDS) {
+        if (doc[field] !== undefined) delta[field] = doc[field];
+      }
+      return delta;
+    });
+    const frame = this._frame('delta', this._id(version, position), JSON.stringify({ version, at, seats, removed }));
+    this.history.push({ version, position, frame });
+    if (position === null) this._base = null;
+    else if (this._base === null && this.history.length === 1) this._base = position;
+    if (this.history.length > this.historySize) {
+      const dropped = this.history.shift();
+      if (this._base !== null) this._base = dropped.position;
+    }
+
+    for (const client of this.clients) {
+      if (!client.synced) this._resync(client);
+      else if (client.after !== null && position !== null && position <= client.after) continue;
+      else this._send(client, frame);
+    }
+  }
+
+  _resync(client) {
+    if (client.snapshot) return this._sendSnapshot(client);
+    this._send(client, this._frame('reset', this.currentId(), `{"version":${this.snapshot.version}}`));
+    client.synced = true;
+  }
+
+  _sendSnapshot(client) {
+    const { version, position, updatedAt, body } = this.snapshot;
+    if (this._snapshotVersion !== version) {
+      const id = this._id(version, position);
+      this._snapshotFrame = this._frame('snapshot', id, `{"version":${version},"at":${updatedAt},"seats":${body}}`);
+      this._snapshotVersion = version;
+    }
+    this._send(client, this._snapshotFrame);
+    client.synced = true;
+  }
+
+  _frame(event, id, data) {
+    return `id: ${id}\nevent: ${event}\ndata: ${data}\n\n`;
+  }
+
+  _write(frame) {
+    for (const client of this.clients) this._send(client, frame);
+  }
+
+  // An empty buffer always takes the frame, so a requested snapshot larger
+  // than the limit still goes out
+  _send(client, frame) {
+    const buffered = client.res.writableLength;
+    if (buffered > 0 && buffered + frame.length > this.maxBufferedBytes) {
+      this.clients.delete(client);
+      client.res.destroy();
+      return;
+    }
+    client.res.write(frame);
+  }
+}
+
+module.exports = { SeatStream };
@@ -0,0 +1,153 @@
+const test = require('node:test');
+const assert = require('node:assert/strict');
+const { EventEmitter } = require('events');
+const { SeatStream } = require('./seatStream');
+
+// Stands in for a SeatSnapshot following a change stream (positions set) or
+// polling (positions null)
+function fakeSnapshot(position) {
+  const snapshot = Object.assign(new EventEmitter(), { ready: true, version: 1, position, updatedAt: 0, body: '[]' });
+  snapshot.publish = nextPosition => {
+    snapshot.version += 1;
+    snapshot.position = nextPosition;
+    snapshot.emit('change', {
+      version: snapshot.version,
+      position: nextPosition,
+      at: 0,
+      changed: [{ room_id: `room-${snapshot.version}`, occupied: 1, building: 'ignored' }],
+      removed: []
+    });
+  };
+  return snapshot;
+}
+
+function openStream(snapshot, options) {
+  const stream = new SeatStream(snapshot, options);
+  test.after(() => stream.close());
+  return stream;
+}
+
+const client = () => ({ after: null });
+const ids = frames => frames.map(frame => frame.match(/^id: (.*)$/m)[1]);
+
+test('positions resume from the frames after them', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot);
+  snapshot.publish(110n);
+  snapshot.publish(120n);
+
+  assert.equal(stream.currentId(), 't120');
+  assert.deepEqual(ids(stream._since('t100', client())), ['t110', 't120']);
+  assert.deepEqual(ids(stream._since('t115', client())), ['t120']);
+  assert.match(stream._since('t110', client())[0], /"seats":\[\{"room_id":"room-3","occupied":1\}\]/);
+});
+
+test('a client ahead of this process gets nothing and skips what it has seen', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot);
+  const ahead = client();
+
+  assert.deepEqual(stream._since('t130', ahead), []);
+  assert.equal(ahead.after, 130n);
+  assert.deepEqual(stream._since('t100', client()), []);
+});
+
+test('broadcasts skip frames a client that was ahead has already seen', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot);
+  const written = [];
+  stream.clients.add({ res: { writableLength: 0, write: frame => written.push(frame), end() {} }, synced: true, after: 125n });
+  snapshot.publish(120n);
+  snapshot.publish(130n);
+
+  assert.deepEqual(ids(written), ['t130']);
+});
+
+test('positions older than the retained history cannot be resumed', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot, { historySize: 2 });
+  snapshot.publish(110n);
+  snapshot.publish(120n);
+  snapshot.publish(130n);
+
+  assert.equal(stream._since('t100', client()), null);
+  assert.deepEqual(ids(stream._since('t110', client())), ['t120', 't130']);
+});
+
+test('without a change stream ids only resume on the process that issued them', () => {
+  const snapshot = fakeSnapshot(null);
+  const stream = openStream(snapshot);
+  const other = openStream(fakeSnapshot(null));
+  snapshot.publish(null);
+  snapshot.publish(null);
+
+  assert.equal(stream.currentId(), `${stream.epoch}-3`);
+  assert.deepEqual(ids(stream._since(`${stream.epoch}-1`, client())), [`${stream.epoch}-2`, `${stream.epoch}-3`]);
+  assert.deepEqual(stream._since(`${stream.epoch}-3`, client()), []);
+  assert.equal(stream._since(`${stream.epoch}-4`, client()), null);
+  assert.equal(other._since(`${stream.epoch}-1`, client()), null);
+  assert.equal(stream._since('t100', client()), null);
+});
+
+test('malformed ids are not resumed', () => {
+  const stream = openStream(fakeSnapshot(100n));
+  for (const id of [undefined, '', 't', 't-1', 'tabc', 'abc', '100']) {
+    assert.equal(stream._since(id, client()), null, String(id));
+  }
+});
+
+// A connected client's request and response; `frames` collects what is written
+function connect(stream, query = {}, lastEventId) {
+  const frames = [];
+  const res = {
+    writableLength: 0,
+    destroyed: false,
+    writeHead() {},
+    flushHeaders() {},
+    write(frame) {
+      frames.push(frame);
+    },
+    end() {},
+    destroy() {
+      res.destroyed = true;
+    }
+  };
+  const req = { query, get: () => lastEventId, socket: { setNoDelay() {} }, on() {} };
+  stream.handle(req, res);
+  return { res, frames };
+}
+
+const events = frames => frames.map(frame => frame.match(/^event: (.*)$/m)[1]);
+
+test('a client that cannot resume gets a reset, not the snapshot', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot);
+
+  const { frames } = connect(stream, { since: 't50' });
+
+  assert.deepEqual(events(frames), ['reset']);
+  assert.equal(frames[0], 'id: t100\nevent: reset\ndata: {"version":1}\n\n');
+  snapshot.publish(110n);
+  assert.deepEqual(events(frames), ['reset', 'delta']);
+});
+
+test('the snapshot is sent only when asked for', () => {
+  const stream = openStream(fakeSnapshot(100n));
+
+  const { frames } = connect(stream, { snapshot: '1' });
+
+  assert.deepEqual(frames, ['id: t100\nevent: snapshot\ndata: {"version":1,"at":0,"seats":[]}\n\n']);
+});
+
+test('a frame that would overflow the socket buffer drops the client', () => {
+  const snapshot = fakeSnapshot(100n);
+  const stream = openStream(snapshot, { maxBufferedBytes: 200 });
+  const { res, frames } = connect(stream, { since: 't100' });
+
+  res.writableLength = 150;
+  snapshot.publish(110n);
+
+  assert.deepEqual(frames, []);
+  assert.equal(res.destroyed, true);
+  assert.equal(stream.clients.size, 0);
+});
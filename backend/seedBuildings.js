@@ -0,0 +1,37 @@
+// Loads the campus layout into the Buildings collection. Existing buildings
+// keep their counts; reconciliation fills them in from OccupancyInfo.
+//   MONGODB_URI=... node seedBuildings.js
+const mongoose = require('mongoose');
+const { Building } = require('./models');
+
+const buildings = [
+  { name: 'Student Learning Centre (SLC)', floors: [3, 4, 5, 6, 7, 8, 9, 10], defaultFloor: 8 },
+  { name: 'George Vari Engineering and Computing Centre', floors: [2], defaultFloor: 2 },
+  { name: 'Ted Rogers School of Management', floors: [7, 8, 9], defaultFloor: 7 }
+];
+
+async function seedBuildings(layout = buildings) {
+  await Building.bulkWrite(layout.map(({ name, floors, defaultFloor }) => ({
+    updateOne: {
+      filter: { name },
+      update: {
+        $set: { defaultFloor },
+        $setOnInsert: { floors: floors.map(floor => ({ floor, available: 0, total: 0 })), available: 0, total: 0 }
+      },
+      upsert: true
+    }
+  })));
+}
+
+module.exports = { seedBuildings };
+
+if (require.main === module) {
+  mongoose.connect(process.env.MONGODB_URI || 'URI')
+    .then(() => seedBuildings())
+    .then(() => console.log(`Seeded ${buildings.length} buildings`))
+    .catch(err => {
+      console.error('Seeding failed:', err.message);
+      process.exitCode = 1;
+    })
+    .finally(() => mongoose.disconnect());
+}
@@ -1,33 +1,124 @@
+const cluster = require('cluster');
 const dns = require('dns');
-dns.setServers(['1.1.1.1', '8.8.8.8']);
-const express = require('express');
+const os = require('os');
 const mongoose = require('mongoose');
-const cors = require('cors');
+const { Seat } = require('./models');
+const { SeatSnapshot } = require('./seatSnapshot');
+const { ReadingBuffer } = require('./readingBuffer');
+const { OccupancyHistory } = require('./occupancyHistory');
+const { AvailabilityCounters } = require('./availabilityCounters');
+const { createApp } = require('./app');
+const { Registry, instrumentMongo, processMetrics } = require('./metrics');
+const { runPrimary } = require('./cluster');
 
-const app = express();
-app.use(cors()); 
-app.use(express.json());
+const mongoURI = process.env.MONGODB_URI || 'URI';
+const port = Number(process.env.PORT) || 5000;
 
-const mongoURI = 'URI';
+// WORKERS=auto runs one worker per core; 1 (the default) is a single process
+const workers = process.env.WORKERS === 'auto'
+  ? os.availableParallelism()
+  : Number(process.env.WORKERS) || 1;
 
-mongoose.connect(mongoURI)
-  .then(() => console.log('SUCCESS: Connected to MongoDB Atlas'))
-  .catch(err => console.error('MongoDB Connection Error:', err.message));
+// Connections per process, so the cluster opens up to WORKERS times this
+const poolSize = Number(process.env.MONGO_POOL_SIZE) || 20;
 
-const SeatSchema = new mongoose.Schema({
-  room_id: String,
-  occupied: Number
-});
+// In-flight requests get this long to finish once shutdown starts
+const shutdownTimeoutMs = Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+const drainNoticeMs = 1000;
 
-const Seat = mongoose.model('Seat', SeatSchema, 'OccupancyInfo');
+// Only for networks whose resolver can't look up Atlas SRV records
+if (process.env.DNS_SERVERS) dns.setServers(process.env.DNS_SERVERS.split(','));
 
-app.get('/api/seats', async (req, res) => {
-  try {
-    const seats = await Seat.find();
-    res.json(seats);
-  } catch (error) {
-    res.status(500).json({ message: "Error fetching seats" });
-  }
-});
+async function startServer() {
+  // SEAT_CACHE=off serves every request from Mongo (used for benchmarking).
+  const snapshot = process.env.SEAT_CACHE === 'off'
+    ? null
+    : new SeatSnapshot(Seat, { pollMs: Number(process.env.SEAT_POLL_MS) || 2000 });
 
-app.listen(5000, () => console.log('Backend running on port 5000'));
+  // History and availability counters follow the snapshot's change events and
+  // write shared aggregates. AGGREGATES=off turns them off, e.g. on all but
+  // one process sharing a database.
+  const maintainAggregates = snapshot && process.env.AGGREGATES !== 'off';
+  const history = maintainAggregates ? new OccupancyHistory(snapshot) : null;
+  const counters = maintainAggregates ? new AvailabilityCounters(snapshot) : null;
+
+  const readings = new ReadingBuffer(Seat, {
+    flushMs: Number(process.env.READING_FLUSH_MS) || 250,
+    maxPending: Number(process.env.READING_MAX_PENDING) || 20000
+  });
+
+  const metrics = new Registry();
+  processMetrics(metrics);
+
+  const connecting = mongoose.connect(mongoURI, { monitorCommands: true, maxPoolSize: poolSize });
+  // The client exists as soon as connect() is called, so this sees the pool's
+  // first connections. SLOW_QUERY_MS logs commands at least that slow.
+  instrumentMongo(mongoose.connection, metrics, { slowQueryMs: Number(process.env.SLOW_QUERY_MS) || 0 });
+  await connecting;
+  console.log('SUCCESS: Connected to MongoDB Atlas');
+
+  readings.start();
+  if (history) history.start();
+  if (counters) counters.start();
+  if (snapshot) await snapshot.start();
+
+  let draining = false;
+  const ready = () => !draining && mongoose.connection.readyState === 1 && (!snapshot || snapshot.ready);
+  const app = createApp({ snapshot, readings, metrics, ready });
+
+  // Listening only once the cache is warm means no request (and, in a
+  // cluster, no rolling restart) ever reaches a process that isn't ready
+  const server = await new Promise((resolve, reject) => {
+    const s = app.listen(port, () => resolve(s));
+    s.once('error', reject);
+  });
+  console.log(`Backend running on port ${port}${cluster.isWorker ? ` (worker ${process.pid})` : ''}`);
+
+  // Draining first answers every request with `Connection: close` (and
+  // /ready with 503) for a moment, so keep-alive clients move elsewhere
+  // before their sockets are closed under them. Then the server stops
+  // accepting connections, in-flight requests finish (whatever is left is
+  // closed after SHUTDOWN_TIMEOUT_MS), and queued readings and aggregates are
+  // flushed before disconnecting from Mongo.
+  let stopping = null;
+  const shutdown = () => {
+    if (stopping) return stopping;
+    draining = true;
+    console.log(`Draining ${process.pid}`);
+    const force = setTimeout(() => server.closeAllConnections(), shutdownTimeoutMs);
+    force.unref();
+
+    stopping = new Promise(resolve => setTimeout(resolve, drainNoticeMs))
+      .then(() => new Promise(resolve => {
+        server.close(resolve);
+        // Event streams never finish on their own; clients reconnect elsewhere
+        if (app.locals.seatStream) app.locals.seatStream.close();
+      }))
+      .then(async () => {
+        clearTimeout(force);
+        if (snapshot) snapshot.stop();
+        await readings.stop();
+        if (history) await history.stop();
+        if (counters) await counters.stop();
+        await mongoose.disconnect();
+      })
+      .catch(err => console.error('Shutdown error:', err.message))
+      .then(() => process.exit(0));
+    return stopping;
+  };
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+
+  server.prependListener('request', (req, res) => {
+    if (draining) res.setHeader('Connection', 'close');
+  });
+}
+
+if (cluster.isPrimary && workers > 1) {
+  runPrimary({ workers });
+} else {
+  startServer().catch(err => {
+    console.error('Startup failed:', err.message);
+    process.exit(1);
+  });
+}
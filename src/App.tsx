@@ -4,20 +4,37 @@ import { Header } from './components/Header';
 import { SeatFilters } from './components/SeatFilters';
 import { SeatList } from './components/SeatList';
 import { Analytics } from './components/Analytics';
-import { useState } from 'react';
-import { buildings } from './utils/buildingData';
+import { useState, useEffect } from 'react';
+import { useBuildings } from './utils/buildingData';
+import { partySize } from './components/PeoplePicker';
 
 export default function App() {
+  const buildings = useBuildings();
   const [activeFilter, setActiveFilter] = useState('all');
   const [selectedBuilding, setSelectedBuilding] = useState('Student Learning Centre (SLC)');
-  const [selectedFloor, setSelectedFloor] = useState(buildings[selectedBuilding].defaultFloor);
+  const [selectedFloor, setSelectedFloor] = useState<number | null>(null);
+  const [selectedPeople, setSelectedPeople] = useState('1 Person');
   const [currentPage, setCurrentPage] = useState<'available-seats' | 'analytics'>('available-seats');
 
+  // The layout comes from the backend; pick the default floor once it arrives
+  useEffect(() => {
+    if (!buildings || selectedFloor !== null) return;
+    const building = buildings[selectedBuilding] ?? Object.values(buildings)[0];
+    if (!building) return;
+    setSelectedBuilding(building.name);
+    setSelectedFloor(building.defaultFloor);
+  }, [buildings, selectedBuilding, selectedFloor]);
+
   const handleBuildingChange = (building: string) => {
     setSelectedBuilding(building);
-    setSelectedFloor(buildings[building].defaultFloor);
+    setSelectedFloor(buildings?.[building]?.defaultFloor ?? null);
   };
 
+  const building = buildings?.[selectedBuilding];
+  if (!buildings || !building || selectedFloor === null) {
+    return <div className="p-8 text-center">Loading TMU study spaces...</div>;
+  }
+
   return (
     <div className="flex h-screen bg-gray-100">
       <Sidebar currentPage={currentPage} onPageChange={setCurrentPage} />
@@ -26,30 +43,38 @@ export default function App() {
           {currentPage === 'available-seats' ? (
             <div className="max-w-7xl mx-auto p-8">
               <Header 
+                buildings={buildings}
                 selectedBuilding={selectedBuilding}
                 onBuildingChange={handleBuildingChange}
-                availableSeats={buildings[selectedBuilding].availableSeats}
+                availableSeats={building.available}
               />
               <SeatFilters 
                 activeFilter={activeFilter} 
                 setActiveFilter={setActiveFilter}
-                availableFloors={buildings[selectedBuilding].floors}
+                availableFloors={building.floors}
                 selectedFloor={selectedFloor}
                 setSelectedFloor={setSelectedFloor}
+                selectedPeople={selectedPeople}
+                setSelectedPeople={setSelectedPeople}
               />
               <SeatList 
+                selectedBuilding={selectedBuilding}
                 activeFilter={activeFilter}
                 selectedFloor={selectedFloor}
+                partySize={partySize(selectedPeople)}
               />
             </div>
           ) : (
             <Analytics
+              buildings={buildings}
               selectedBuilding={selectedBuilding}
               onBuildingChange={handleBuildingChange}
-              availableSeats={buildings[selectedBuilding].availableSeats}
-              availableFloors={buildings[selectedBuilding].floors}
+              availableSeats={building.available}
+              availableFloors={building.floors}
               selectedFloor={selectedFloor}
               setSelectedFloor={setSelectedFloor}
+              selectedPeople={selectedPeople}
+              setSelectedPeople={setSelectedPeople}
             />
           )}
         </main>
@@ -0,0 +1,124 @@
+import React, { useState, useEffect } from 'react';
+import ReactDOM from 'react-dom/client';
+import { flushSync } from 'react-dom';
+import { SeatGrid } from '../components/SeatGrid';
+import { Badge } from '../components/ui/badge';
+import { SeatStore, SeatData } from '../utils/seatStore';
+import '../index.css';
+
+// Rendering benchmark for the seat list, opened at /bench.html on the Vite
+// dev server (`npm run bench:render`). Compares the windowed SeatGrid with
+// rendering every card on each change. Query parameters: seats, deltas.
+const params = new URLSearchParams(location.search);
+const SEATS = Number(params.get('seats')) || 10000;
+const DELTAS = Number(params.get('deltas')) || 200;
+
+function makeSeats(count: number): SeatData[] {
+  return Array.from({ length: count }, (_, i) => ({
+    room_id: `R${String(i).padStart(5, '0')}`,
+    occupied: i % 3 === 0 ? 1 : 0,
+  }));
+}
+
+// The list as it was: one state object, every card re-rendered on any change
+let setNaiveSeats: (update: (prev: Record<string, SeatData>) => Record<string, SeatData>) => void = () => {};
+
+function NaiveList({ initial }: { initial: Record<string, SeatData> }) {
+  const [seats, setSeats] = useState(initial);
+  useEffect(() => {
+    setNaiveSeats = setSeats;
+  }, []);
+  return (
+    <div className="grid gap-4 p-4">
+      {Object.values(seats).map((seat) => (
+        <div key={seat.room_id} className="p-4 border rounded-lg bg-card text-card-foreground shadow-sm">
+          <div className="flex justify-between items-center">
+            <span className="text-lg font-semibold">{seat.room_id}</span>
+            <Badge variant={seat.occupied === 1 ? "destructive" : "default"}>
+              {seat.occupied === 1 ? "Occupied" : "Available"}
+            </Badge>
+          </div>
+          <div className="mt-4 text-xs text-muted-foreground">
+            Last updated: {new Date().toLocaleTimeString()}
+          </div>
+        </div>
+      ))}
+    </div>
+  );
+}
+
+const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+
+function heapMb() {
+  const memory = (performance as unknown as { memory?: { usedJSHeapSize: number } }).memory;
+  return memory ? memory.usedJSHeapSize / 1024 / 1024 : NaN;
+}
+
+function median(values: number[]) {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+async function measure(name: string, mount: (root: ReactDOM.Root) => void, applyDelta: (i: number) => void) {
+  const container = document.createElement('div');
+  document.getElementById('stage')!.appendChild(container);
+  const root = ReactDOM.createRoot(container);
+  const heapBefore = heapMb();
+
+  const start = performance.now();
+  mount(root);
+  await nextFrame();
+  const firstPaint = performance.now() - start;
+
+  const costs: number[] = [];
+  for (let i = 0; i < DELTAS; i++) {
+    const t0 = performance.now();
+    flushSync(() => applyDelta(i));
+    costs.push(performance.now() - t0);
+  }
+  await nextFrame();
+  const heap = heapMb() - heapBefore;
+
+  root.unmount();
+  container.remove();
+  return {
+    name,
+    'first paint (ms)': firstPaint.toFixed(1),
+    'delta median (ms)': median(costs).toFixed(3),
+    'delta max (ms)': Math.max(...costs).toFixed(3),
+    'heap (MB)': Number.isNaN(heap) ? 'n/a' : heap.toFixed(1),
+  };
+}
+
+async function run() {
+  const seats = makeSeats(SEATS);
+  // Deltas hit the first rows, which both lists have on screen
+  const changed = (i: number): SeatData => ({
+    room_id: seats[i % 10].room_id,
+    occupied: i % 2,
+    updated_at: new Date().toISOString(),
+  });
+
+  const naive = await measure(
+    'render every card',
+    (root) => root.render(<NaiveList initial={Object.fromEntries(seats.map((seat) => [seat.room_id, seat]))} />),
+    (i) => setNaiveSeats((prev) => ({ ...prev, [changed(i).room_id]: { ...prev[changed(i).room_id], ...changed(i) } })),
+  );
+
+  const store = new SeatStore();
+  const windowed = await measure(
+    'SeatGrid (windowed)',
+    (root) => {
+      store.replace(seats);
+      root.render(<SeatGrid store={store} />);
+    },
+    (i) => store.applyDelta([changed(i)], []),
+  );
+
+  const results = [naive, windowed];
+  console.table(results);
+  document.getElementById('results')!.textContent =
+    `${SEATS} seats, ${DELTAS} deltas\n` + results.map((r) => JSON.stringify(r)).join('\n');
+}
+
+run();
@@ -3,27 +3,35 @@ import { Header } from './Header';
 import { SeatFilters } from './SeatFilters';
 import { AnalyticsMetrics } from './AnalyticsMetrics';
 import { RoomHistory } from './RoomHistory';
+import type { BuildingConfig, FloorConfig } from '../utils/buildingData';
 
 interface AnalyticsProps {
+  buildings: Record<string, BuildingConfig>;
   selectedBuilding: string;
   onBuildingChange: (building: string) => void;
   availableSeats: number;
-  availableFloors: number[];
+  availableFloors: FloorConfig[];
   selectedFloor: number;
   setSelectedFloor: (floor: number) => void;
+  selectedPeople: string;
+  setSelectedPeople: (people: string) => void;
 }
 
 export function Analytics({ 
+  buildings,
   selectedBuilding, 
   onBuildingChange, 
   availableSeats,
   availableFloors,
   selectedFloor,
-  setSelectedFloor
+  setSelectedFloor,
+  selectedPeople,
+  setSelectedPeople
 }: AnalyticsProps) {
   return (
     <div className="max-w-7xl mx-auto p-8">
       <Header 
+        buildings={buildings}
         selectedBuilding={selectedBuilding}
         onBuildingChange={onBuildingChange}
         availableSeats={availableSeats}
@@ -34,9 +42,11 @@ export function Analytics({
         availableFloors={availableFloors}
         selectedFloor={selectedFloor}
         setSelectedFloor={setSelectedFloor}
+        selectedPeople={selectedPeople}
+        setSelectedPeople={setSelectedPeople}
       />
-      <AnalyticsMetrics />
-      <RoomHistory selectedFloor={selectedFloor} />
+      <AnalyticsMetrics selectedBuilding={selectedBuilding} selectedFloor={selectedFloor} />
+      <RoomHistory selectedBuilding={selectedBuilding} selectedFloor={selectedFloor} />
     </div>
   );
 }
@@ -1,26 +1,74 @@
-import React from 'react';
+/// <reference types="vite/client" />
+import React, { useState, useEffect } from 'react';
 import { TrendingUp, TrendingDown } from 'lucide-react';
 
-export function AnalyticsMetrics() {
+interface Stats {
+  utilization: number;
+  meanOccupancy: number;
+  peak: number;
+}
+
+interface WeekOverWeek {
+  current: Stats | null;
+  previous: Stats | null;
+}
+
+// Response of /api/analytics, computed from daily rollups
+interface AnalyticsResponse {
+  building: WeekOverWeek;
+  floor: WeekOverWeek | null;
+}
+
+interface AnalyticsMetricsProps {
+  selectedBuilding: string;
+  selectedFloor: number;
+}
+
+export function AnalyticsMetrics({ selectedBuilding, selectedFloor }: AnalyticsMetricsProps) {
+  const [data, setData] = useState<AnalyticsResponse | null>(null);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const fetchAnalytics = async () => {
+      try {
+        const apiUrl = import.meta.env.VITE_API_URL;
+        const params = new URLSearchParams({ building: selectedBuilding, floor: String(selectedFloor) });
+        const response = await fetch(`${apiUrl}/api/analytics?${params}`, { signal: controller.signal });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const body = await response.json();
+        if (!body || typeof body.building !== 'object') throw new Error('Unexpected analytics response');
+        setData(body);
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error("Error fetching analytics:", error);
+        setData(null);
+      }
+    };
+
+    fetchAnalytics();
+    return () => controller.abort();
+  }, [selectedBuilding, selectedFloor]);
+
+  const toMetric = (
+    title: string,
+    stats: WeekOverWeek | null | undefined,
+    pick: (s: Stats) => number,
+    format: (n: number) => string,
+  ) => {
+    // No trend unless both weeks have rollups to compare
+    const compared = stats?.current && stats.previous ? { current: stats.current, previous: stats.previous } : null;
+    return {
+      title,
+      value: stats?.current ? format(pick(stats.current)) : '–',
+      trend: compared ? (pick(compared.current) < pick(compared.previous) ? 'down' : 'up') : null,
+      subtitle: compared ? 'vs last week' : 'No data for last week',
+    };
+  };
+
   const metrics = [
-    {
-      title: 'Room Utilization Rate (%)',
-      value: '23.9',
-      trend: 'up',
-      subtitle: 'vs last week',
-    },
-    {
-      title: 'Avg. Occupancy per Room',
-      value: '4 people',
-      trend: 'down',
-      subtitle: 'vs last week',
-    },
-    {
-      title: 'Floor Capacity (%)',
-      value: '80',
-      trend: 'up',
-      subtitle: 'vs last week',
-    },
+    toMetric('Room Utilization Rate (%)', data?.building, (s) => s.utilization, (n) => (n * 100).toFixed(1)),
+    toMetric('Avg. Occupied Seats', data?.floor, (s) => s.meanOccupancy, (n) => `${n.toFixed(1)} people`),
+    toMetric('Floor Capacity (%)', data?.floor, (s) => s.utilization, (n) => (n * 100).toFixed(0)),
   ];
 
   return (
@@ -30,11 +78,8 @@ export function AnalyticsMetrics() {
           <h3 className="text-gray-700 text-sm mb-3">{metric.title}</h3>
           <div className="flex items-center gap-2 mb-2">
             <span className="text-4xl font-semibold text-gray-900">{metric.value}</span>
-            {metric.trend === 'up' ? (
-              <TrendingUp className="w-6 h-6 text-green-500" />
-            ) : (
-              <TrendingDown className="w-6 h-6 text-red-500" />
-            )}
+            {metric.trend === 'up' && <TrendingUp className="w-6 h-6 text-green-500" />}
+            {metric.trend === 'down' && <TrendingDown className="w-6 h-6 text-red-500" />}
           </div>
           <p className="text-sm text-gray-500 italic">{metric.subtitle}</p>
         </div>
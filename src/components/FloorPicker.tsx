@@ -1,9 +1,11 @@
 import React from 'react';
+import type { FloorConfig } from '../utils/buildingData';
+
 interface FloorPickerProps {
   selectedFloor: number;
   onSelectFloor: (floor: number) => void;
   onClose: () => void;
-  availableFloors: number[];
+  availableFloors: FloorConfig[];
 }
 
 export function FloorPicker({ selectedFloor, onSelectFloor, onClose, availableFloors }: FloorPickerProps) {
@@ -14,15 +16,16 @@ export function FloorPicker({ selectedFloor, onSelectFloor, onClose, availableFl
 
   return (
     <div className="absolute top-full left-0 mt-2 bg-white border border-gray-300 rounded-lg shadow-lg py-2 z-50 w-full">
-      {availableFloors.map((floor) => (
+      {availableFloors.map(({ floor, available }) => (
         <button
           key={floor}
           onClick={() => handleFloorClick(floor)}
-          className={`w-full px-4 py-2.5 text-left hover:bg-gray-100 transition-colors ${
+          className={`w-full flex justify-between px-4 py-2.5 text-left hover:bg-gray-100 transition-colors ${
             selectedFloor === floor ? 'bg-blue-50 text-blue-600 font-medium' : 'text-gray-900'
           }`}
         >
-          Floor {floor}
+          <span>Floor {floor}</span>
+          <span className="text-sm text-gray-500">{available} free</span>
         </button>
       ))}
     </div>
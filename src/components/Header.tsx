@@ -1,25 +1,21 @@
 import React from 'react';
 import { Search } from 'lucide-react';
 import { useState, useRef, useEffect } from 'react';
+import type { BuildingConfig } from '../utils/buildingData';
 
 interface HeaderProps {
+  buildings: Record<string, BuildingConfig>;
   selectedBuilding: string;
   onBuildingChange: (building: string) => void;
   availableSeats: number;
 }
 
-export function Header({ selectedBuilding, onBuildingChange, availableSeats }: HeaderProps) {
+export function Header({ buildings, selectedBuilding, onBuildingChange, availableSeats }: HeaderProps) {
   const [showBuildingOptions, setShowBuildingOptions] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const searchRef = useRef<HTMLDivElement>(null);
 
-  const buildings = [
-    'Student Learning Centre (SLC)',
-    'George Vari Engineering and Computing Centre',
-    'Ted Rogers School of Management'
-  ];
-
-  const filteredBuildings = buildings.filter(building =>
+  const filteredBuildings = Object.keys(buildings).filter(building =>
     building.toLowerCase().includes(searchQuery.toLowerCase())
   );
 
@@ -83,11 +79,12 @@ export function Header({ selectedBuilding, onBuildingChange, availableSeats }: H
                 <button
                   key={building}
                   onClick={() => handleBuildingSelect(building)}
-                  className={`w-full px-4 py-3 text-left hover:bg-gray-100 transition-colors ${
+                  className={`w-full flex justify-between px-4 py-3 text-left hover:bg-gray-100 transition-colors ${
                     selectedBuilding === building ? 'bg-blue-50 text-blue-600 font-medium' : 'text-gray-900'
                   }`}
                 >
-                  {building}
+                  <span>{building}</span>
+                  <span className="text-sm text-gray-500">{buildings[building].available} available</span>
                 </button>
               ))
             ) : (
@@ -5,6 +5,11 @@ interface PeoplePickerProps {
   onClose: () => void;
 }
 
+// Smallest seat capacity that fits a PeoplePicker option
+export function partySize(option: string): number {
+  return option === 'More than 4' ? 5 : parseInt(option, 10) || 1;
+}
+
 export function PeoplePicker({ selectedPeople, onSelectPeople, onClose }: PeoplePickerProps) {
   const peopleOptions = ['1 Person', '2 People', '3 People', '4 People', 'More than 4'];
 
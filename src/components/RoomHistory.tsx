@@ -1,52 +1,71 @@
-import React from 'react';
+/// <reference types="vite/client" />
+import React, { useState, useEffect } from 'react';
 import { Accessibility } from 'lucide-react';
 
 interface RoomHistoryProps {
+  selectedBuilding: string;
   selectedFloor: number;
 }
 
-export function RoomHistory({ selectedFloor }: RoomHistoryProps) {
-  // Generate room numbers based on selected floor
-  const rooms = [
-    {
-      id: 1,
-      number: `Room ${selectedFloor}01`,
-      status: 'Available',
-      accessible: true,
-    },
-    {
-      id: 2,
-      number: `Room ${selectedFloor}02`,
-      status: 'Available',
-      accessible: true,
-    },
-    {
-      id: 3,
-      number: `Room ${selectedFloor}03`,
-      status: 'Available',
-      accessible: true,
-    },
-  ];
+// Rows of /api/analytics/rooms, least used first
+interface RoomUsage {
+  room_id: string;
+  utilization: number;
+  accessible: boolean;
+}
+
+export function RoomHistory({ selectedBuilding, selectedFloor }: RoomHistoryProps) {
+  const [rooms, setRooms] = useState<RoomUsage[]>([]);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const fetchRooms = async () => {
+      try {
+        const apiUrl = import.meta.env.VITE_API_URL;
+        const params = new URLSearchParams({ building: selectedBuilding, floor: String(selectedFloor), limit: '3' });
+        const response = await fetch(`${apiUrl}/api/analytics/rooms?${params}`, { signal: controller.signal });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const body = await response.json();
+        if (!Array.isArray(body)) throw new Error('Unexpected room history response');
+        setRooms(body);
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error("Error fetching room history:", error);
+        setRooms([]);
+      }
+    };
+
+    fetchRooms();
+    return () => controller.abort();
+  }, [selectedBuilding, selectedFloor]);
 
   return (
     <div className="bg-white rounded-2xl shadow-sm border border-gray-200 p-6">
       <h2 className="text-lg font-semibold text-gray-900 mb-6">Based on Historical Data:</h2>
       <div className="space-y-4">
-        {rooms.map((room) => (
-          <div
-            key={room.id}
-            className="flex items-center gap-4 px-6 py-4 bg-white border border-gray-200 rounded-xl"
-          >
-            <div className="w-6 h-6 rounded-full bg-green-500 flex-shrink-0" />
-            <span className="flex-1 text-left font-medium text-gray-900">
-              {room.number}
-            </span>
-            <span className="text-gray-900 font-medium">{room.status}</span>
-            {room.accessible && (
-              <Accessibility className="w-6 h-6 text-gray-700" />
-            )}
-          </div>
-        ))}
+        {rooms.length === 0 && (
+          <div className="px-6 py-4 text-gray-500">No history for this floor yet</div>
+        )}
+        {rooms.map((room) => {
+          const usuallyFree = room.utilization < 0.5;
+          return (
+            <div
+              key={room.room_id}
+              className="flex items-center gap-4 px-6 py-4 bg-white border border-gray-200 rounded-xl"
+            >
+              <div className={`w-6 h-6 rounded-full flex-shrink-0 ${usuallyFree ? 'bg-green-500' : 'bg-yellow-400'}`} />
+              <span className="flex-1 text-left font-medium text-gray-900">
+                Room {room.room_id}
+              </span>
+              <span className="text-gray-900 font-medium">
+                {usuallyFree ? 'Available' : 'Busy'} ({Math.round(room.utilization * 100)}% used)
+              </span>
+              {room.accessible && (
+                <Accessibility className="w-6 h-6 text-gray-700" />
+              )}
+            </div>
+          );
+        })}
       </div>
     </div>
   );
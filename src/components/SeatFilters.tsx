@@ -5,16 +5,19 @@ import { Calendar } from './Calendar';
 import { TimePicker } from './TimePicker';
 import { FloorPicker } from './FloorPicker';
 import { PeoplePicker } from './PeoplePicker';
+import type { FloorConfig } from '../utils/buildingData';
 
 interface SeatFiltersProps {
   activeFilter: string;
   setActiveFilter: (filter: string) => void;
-  availableFloors: number[];
+  availableFloors: FloorConfig[];
   selectedFloor: number;
   setSelectedFloor: (floor: number) => void;
+  selectedPeople: string;
+  setSelectedPeople: (people: string) => void;
 }
 
-export function SeatFilters({ activeFilter, setActiveFilter, availableFloors, selectedFloor, setSelectedFloor }: SeatFiltersProps) {
+export function SeatFilters({ activeFilter, setActiveFilter, availableFloors, selectedFloor, setSelectedFloor, selectedPeople, setSelectedPeople }: SeatFiltersProps) {
   const [showCalendar, setShowCalendar] = useState(false);
   const [selectedDate, setSelectedDate] = useState(new Date(2025, 9, 25)); // October 25, 2025
   const calendarRef = useRef<HTMLDivElement>(null);
@@ -27,7 +30,6 @@ export function SeatFilters({ activeFilter, setActiveFilter, availableFloors, se
   const floorPickerRef = useRef<HTMLDivElement>(null);
 
   const [showPeoplePicker, setShowPeoplePicker] = useState(false);
-  const [selectedPeople, setSelectedPeople] = useState('1 Person');
   const peoplePickerRef = useRef<HTMLDivElement>(null);
 
   const formatDate = (date: Date) => {
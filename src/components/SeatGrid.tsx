@@ -0,0 +1,79 @@
+import React, { memo, useEffect, useState } from 'react';
+import { Badge } from "./ui/badge";
+import { SeatStore, useSeat, useSeatOrder } from '../utils/seatStore';
+
+// Every card is drawn at this height so rows can be positioned without
+// measuring them
+const ROW_HEIGHT = 132;
+const ROW_GAP = 16;
+const OVERSCAN = 4;
+
+interface SeatRowProps {
+  store: SeatStore;
+  roomId: string;
+  top: number;
+}
+
+// Subscribes to its own seat only, so a delta re-renders just this card
+const SeatRow = memo(function SeatRow({ store, roomId, top }: SeatRowProps) {
+  const seat = useSeat(store, roomId);
+  if (!seat) return null;
+
+  return (
+    <div
+      className="absolute left-0 right-0 p-4 border rounded-lg bg-card text-card-foreground shadow-sm"
+      style={{ top, height: ROW_HEIGHT - ROW_GAP }}
+    >
+      <div className="flex justify-between items-center">
+        <div className="flex flex-col">
+          <span className="text-sm font-medium text-muted-foreground">Location</span>
+          <span className="text-lg font-semibold">{seat.room_id || "General Study Space"}</span>
+        </div>
+
+        <Badge variant={seat.occupied === 1 ? "destructive" : "default"}>
+          {seat.occupied === 1 ? "Occupied" : "Available"}
+        </Badge>
+      </div>
+
+      <div className="mt-4 text-xs text-muted-foreground">
+        Last updated: {seat.updated_at ? new Date(seat.updated_at).toLocaleTimeString() : "Unknown"}
+      </div>
+    </div>
+  );
+});
+
+interface SeatGridProps {
+  store: SeatStore;
+  height?: number;
+  onEndReached?: () => void;
+}
+
+// Windowed list: only the rows in view (plus OVERSCAN on each side) are
+// mounted, whatever the number of seats in the store
+export function SeatGrid({ store, height = 640, onEndReached }: SeatGridProps) {
+  const order = useSeatOrder(store);
+  const [scrollTop, setScrollTop] = useState(0);
+
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const last = Math.min(order.length, Math.ceil((scrollTop + height) / ROW_HEIGHT) + OVERSCAN);
+  const rows = [];
+  for (let i = first; i < last; i++) {
+    rows.push(<SeatRow key={order[i]} store={store} roomId={order[i]} top={i * ROW_HEIGHT} />);
+  }
+
+  useEffect(() => {
+    if (onEndReached && order.length > 0 && last === order.length) onEndReached();
+  }, [last, order.length, onEndReached]);
+
+  return (
+    <div
+      className="overflow-y-auto"
+      style={{ height: Math.min(height, order.length * ROW_HEIGHT) }}
+      onScroll={(event) => setScrollTop(event.currentTarget.scrollTop)}
+    >
+      <div className="relative" style={{ height: order.length * ROW_HEIGHT }}>
+        {rows}
+      </div>
+    </div>
+  );
+}
@@ -1,60 +1,123 @@
 /// <reference types="vite/client" />
-import React, { useState, useEffect } from 'react';
-import { Badge } from "./ui/badge";
-
-// 1. Define the structure outside the function
-interface SeatData {
-  _id: string;
-  room_id: string;
-  occupied: number;
-  co2_ppm?: number;
-  temperature_c?: number;
+import React, { useState, useEffect, useCallback, useRef } from 'react';
+import { SeatGrid } from './SeatGrid';
+import { SeatStore, SeatData } from '../utils/seatStore';
+
+// Response of /api/seats/query
+interface SeatPage {
+  seats: SeatData[];
+  nextCursor: string | null;
+  streamId?: string;
+}
+
+// Payload of the `delta` event on /api/seats/stream
+interface DeltaEvent {
+  version: number;
+  at: number;
+  seats: SeatData[];
+  removed: string[];
+}
+
+interface SeatListProps {
+  selectedBuilding: string;
+  selectedFloor: number;
+  activeFilter: string;
+  partySize: number;
 }
 
-export function SeatList() {
-  const [seats, setSeats] = useState<SeatData[]>([]); 
+export function SeatList({ selectedBuilding, selectedFloor, activeFilter, partySize }: SeatListProps) {
+  // The store lives for the component's lifetime; a filter change replaces
+  // its contents rather than the store
+  const [store] = useState(() => new SeatStore());
   const [loading, setLoading] = useState(true);
-  
+  const nextCursor = useRef<string | null>(null);
+  const loadingMore = useRef(false);
+  // Aborted when the filter changes, so pages of the old query are dropped
+  const query = useRef<AbortController | null>(null);
+
+  const fetchPage = useCallback(async (cursor: string | null, signal?: AbortSignal): Promise<SeatPage> => {
+    const apiUrl = import.meta.env.VITE_API_URL;
+    const params = new URLSearchParams({
+      building: selectedBuilding,
+      floor: String(selectedFloor),
+      partySize: String(partySize),
+    });
+    if (activeFilter === 'available') params.set('available', '1');
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${apiUrl}/api/seats/query?${params}`, { signal });
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const body = await response.json();
+    if (!body || !Array.isArray(body.seats)) throw new Error('Unexpected seat query response');
+    return body;
+  }, [selectedBuilding, selectedFloor, activeFilter, partySize]);
+
   useEffect(() => {
-    const fetchSeats = async () => {
+    const apiUrl = import.meta.env.VITE_API_URL;
+    const controller = new AbortController();
+    query.current = controller;
+    // A cursor from the previous filter must not be used with this one
+    nextCursor.current = null;
+    let source: EventSource | null = null;
+    setLoading(true);
+
+    const load = async () => {
       try {
-        const apiUrl = import.meta.env.VITE_API_URL; 
-        
-        const response = await fetch(`${apiUrl}/api/seats`);
-        const data = await response.json();
-        setSeats(data);
+        const page = await fetchPage(null, controller.signal);
+        store.replace(page.seats);
+        nextCursor.current = page.nextCursor;
+        if (!page.streamId) return;
+        // Resume from the point the page was read at: only later changes are
+        // sent, by whichever worker answers. EventSource reconnects with Last-Event-ID on its own.
+        source = new EventSource(`${apiUrl}/api/seats/stream?since=${page.streamId}`);
+        source.addEventListener('delta', (event) => {
+          const { seats: changed, removed }: DeltaEvent = JSON.parse((event as MessageEvent).data);
+          store.applyDelta(changed, removed);
+        });
+        // Sent when the server could not resume; re-read the filtered page
+        source.addEventListener('reset', () => {
+          fetchPage(null, controller.signal)
+            .then((fresh) => {
+              store.replace(fresh.seats);
+              nextCursor.current = fresh.nextCursor;
+            })
+            .catch(() => {});
+        });
       } catch (error) {
-        console.error("Error fetching from MongoDB:", error);
+        if (!controller.signal.aborted) console.error("Error fetching from MongoDB:", error);
       } finally {
-        setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     };
 
-    fetchSeats();
-  }, []);
+    load();
+    return () => {
+      controller.abort();
+      source?.close();
+    };
+  }, [fetchPage, store]);
+
+  // Called by the grid when its window reaches the last loaded seat
+  const loadMore = useCallback(async () => {
+    const controller = query.current;
+    if (!controller || !nextCursor.current || loadingMore.current) return;
+    loadingMore.current = true;
+    try {
+      const page = await fetchPage(nextCursor.current, controller.signal);
+      if (controller.signal.aborted) return;
+      store.append(page.seats);
+      nextCursor.current = page.nextCursor;
+    } catch (error) {
+      if (!controller.signal.aborted) console.error("Error fetching from MongoDB:", error);
+    } finally {
+      loadingMore.current = false;
+    }
+  }, [fetchPage, store]);
 
   if (loading) return <div className="p-8 text-center">Loading TMU study spaces...</div>;
 
   return (
-    <div className="grid gap-4 p-4">
-      {seats.map((seat) => (
-        <div key={seat._id} className="p-4 border rounded-lg bg-card text-card-foreground shadow-sm">
-          <div className="flex justify-between items-center">
-            <div className="flex flex-col">
-              <span className="text-sm font-medium text-muted-foreground">Location</span>
-              <span className="text-lg font-semibold">{seat.room_id || "General Study Space"}</span>
-            </div>
-            
-            <Badge variant={seat.occupied === 1 ? "destructive" : "default"}>
-              {seat.occupied === 1 ? "Occupied" : "Available"}
-            </Badge>
-          </div>
-          
-          <div className="mt-4 text-xs text-muted-foreground">
-            Last updated: {new Date().toLocaleTimeString()}
-          </div>
-        </div>
-      ))}
+    <div className="p-4">
+      <SeatGrid store={store} onEndReached={loadMore} />
     </div>
   );
 }
\ No newline at end of file
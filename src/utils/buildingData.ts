@@ -1,42 +1,76 @@
+/// <reference types="vite/client" />
+import { useState, useEffect } from 'react';
+
+export interface FloorConfig {
+  floor: number;
+  available: number;
+  total: number;
+}
+
+// One document of /api/buildings; counts are kept live by the backend
 export interface BuildingConfig {
   name: string;
-  availableSeats: number;
-  floors: number[];
+  available: number;
+  total: number;
+  floors: FloorConfig[];
   defaultFloor: number;
 }
 
-export const buildings: Record<string, BuildingConfig> = {
-  'Student Learning Centre (SLC)': {
-    name: 'Student Learning Centre (SLC)',
-    availableSeats: 48,
-    floors: [3, 4, 5, 6, 7, 8, 9, 10],
-    defaultFloor: 8,
-  },
-  'George Vari Engineering and Computing Centre': {
-    name: 'George Vari Engineering and Computing Centre',
-    availableSeats: 30,
-    floors: [2],
-    defaultFloor: 2,
-  },
-  'Ted Rogers School of Management': {
-    name: 'Ted Rogers School of Management',
-    availableSeats: 40,
-    floors: [7, 8, 9],
-    defaultFloor: 7,
-  },
-};
-
-export function generateSeatsForFloor(floor: number, count: number = 8) {
+// Building layout and seat counts, keyed by name and refreshed every
+// `refreshMs`. The browser revalidates with the server's ETag, so unchanged
+// counts cost a 304.
+export function useBuildings(refreshMs: number = 15000) {
+  const [buildings, setBuildings] = useState<Record<string, BuildingConfig> | null>(null);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const fetchBuildings = async () => {
+      try {
+        const apiUrl = import.meta.env.VITE_API_URL;
+        const response = await fetch(`${apiUrl}/api/buildings`, { cache: 'no-cache', signal: controller.signal });
+        const list: BuildingConfig[] = await response.json();
+        setBuildings(Object.fromEntries(list.map((building) => [building.name, building])));
+      } catch (error) {
+        if (!controller.signal.aborted) console.error("Error fetching buildings:", error);
+      }
+    };
+
+    fetchBuildings();
+    const timer = setInterval(fetchBuildings, refreshMs);
+    return () => {
+      clearInterval(timer);
+      controller.abort();
+    };
+  }, [refreshMs]);
+
+  return buildings;
+}
+
+// Deterministic stand-in for seat data: the same floor and seed always give
+// the same seats. Uses mulberry32, as the backend's synthetic campus does.
+function createRandom(seed: number) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+export function generateSeatsForFloor(floor: number, count: number = 8, seed: number = floor) {
   const seats = [];
   const baseNumber = floor * 100;
+  const random = createRandom(seed);
   
   for (let i = 0; i < count; i++) {
     const seatNumber = baseNumber + i;
     seats.push({
       id: seatNumber.toString(),
       number: `Seat ${seatNumber}`,
-      available: Math.random() > 0.3, // Random availability
-      accessible: Math.random() > 0.7, // Some seats are accessible
+      available: random() > 0.3, // Random availability
+      accessible: random() > 0.7, // Some seats are accessible
     });
   }
   
@@ -0,0 +1,77 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+import { SeatStore, type SeatData } from './seatStore';
+
+const seat = (room_id: string, occupied = 0): SeatData => ({ room_id, occupied, building: 'A', floor: 1 });
+
+// Counts notifications per room and for the order
+function watch(store: SeatStore, roomIds: string[]) {
+  const calls: Record<string, number> = { order: 0 };
+  store.subscribeOrder(() => calls.order++);
+  for (const roomId of roomIds) {
+    calls[roomId] = 0;
+    store.subscribeSeat(roomId, () => calls[roomId]++);
+  }
+  return calls;
+}
+
+test('applyDelta merges changed fields and wakes only those rooms', () => {
+  const store = new SeatStore();
+  store.replace([seat('a'), seat('b')]);
+  const before = store.getSeat('b');
+  const order = store.getOrder();
+  const calls = watch(store, ['a', 'b']);
+
+  store.applyDelta([{ room_id: 'a', occupied: 1, updated_at: '2024-01-01T00:00:00.000Z' }], []);
+
+  assert.deepEqual(store.getSeat('a'), { ...seat('a', 1), updated_at: '2024-01-01T00:00:00.000Z' });
+  assert.equal(store.getSeat('b'), before);
+  assert.equal(store.getOrder(), order);
+  assert.deepEqual(calls, { order: 0, a: 1, b: 0 });
+});
+
+test('applyDelta ignores rooms outside the current result', () => {
+  const store = new SeatStore();
+  store.replace([seat('a')]);
+  const calls = watch(store, ['a', 'z']);
+
+  store.applyDelta([seat('z', 1)], ['y']);
+
+  assert.equal(store.getSeat('z'), undefined);
+  assert.deepEqual(store.getOrder(), ['a']);
+  assert.deepEqual(calls, { order: 0, a: 0, z: 0 });
+});
+
+test('applyDelta removes rooms and replaces the order', () => {
+  const store = new SeatStore();
+  store.replace([seat('a'), seat('b'), seat('c')]);
+  const calls = watch(store, ['a', 'b']);
+
+  store.applyDelta([], ['b']);
+
+  assert.equal(store.getSeat('b'), undefined);
+  assert.deepEqual(store.getOrder(), ['a', 'c']);
+  assert.deepEqual(calls, { order: 1, a: 0, b: 1 });
+});
+
+test('replace notifies rooms that dropped out of the result', () => {
+  const store = new SeatStore();
+  store.replace([seat('a'), seat('b')]);
+  const calls = watch(store, ['a', 'b']);
+
+  store.replace([seat('a', 1)]);
+
+  assert.deepEqual(store.getOrder(), ['a']);
+  assert.equal(store.getSeat('b'), undefined);
+  assert.deepEqual(calls, { order: 1, a: 1, b: 1 });
+});
+
+test('append keeps the order and adds only new rooms', () => {
+  const store = new SeatStore();
+  store.replace([seat('a'), seat('b')]);
+
+  store.append([seat('b', 1), seat('c')]);
+
+  assert.deepEqual(store.getOrder(), ['a', 'b', 'c']);
+  assert.equal(store.getSeat('b')?.occupied, 1);
+});
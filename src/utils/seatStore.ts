@@ -0,0 +1,109 @@
+import { useCallback, useSyncExternalStore } from 'react';
+
+export interface SeatData {
+  room_id: string;
+  occupied: number;
+  building?: string;
+  floor?: number;
+  accessible?: boolean;
+  capacity?: number;
+  co2_ppm?: number;
+  temperature_c?: number;
+  // Time of the seat's latest sensor reading (ISO string from the API)
+  updated_at?: string;
+}
+
+type Listener = () => void;
+
+// Normalized seat state: seats by room_id plus the list order. A seat's
+// object is only replaced when that seat changes, and listeners are kept per
+// room, so a delta wakes exactly the rows it touches. The order array is
+// replaced only when membership changes.
+export class SeatStore {
+  private seats = new Map<string, SeatData>();
+  private order: string[] = [];
+  private seatListeners = new Map<string, Set<Listener>>();
+  private orderListeners = new Set<Listener>();
+
+  getSeat = (roomId: string) => this.seats.get(roomId);
+
+  getOrder = () => this.order;
+
+  // Replaces the contents with the first page of a new query
+  replace(seats: SeatData[]) {
+    const previous = this.seats;
+    this.seats = new Map();
+    this.order = [];
+    this.append(seats);
+    for (const roomId of previous.keys()) {
+      if (!this.seats.has(roomId)) this.notifySeat(roomId);
+    }
+  }
+
+  append(seats: SeatData[]) {
+    const added: string[] = [];
+    for (const seat of seats) {
+      if (!this.seats.has(seat.room_id)) added.push(seat.room_id);
+      this.seats.set(seat.room_id, seat);
+      this.notifySeat(seat.room_id);
+    }
+    this.order = [...this.order, ...added];
+    this.notifyOrder();
+  }
+
+  // Applies a stream delta; rooms outside the current result are ignored
+  applyDelta(changed: SeatData[], removed: string[]) {
+    for (const seat of changed) {
+      const current = this.seats.get(seat.room_id);
+      if (!current) continue;
+      this.seats.set(seat.room_id, { ...current, ...seat });
+      this.notifySeat(seat.room_id);
+    }
+    if (removed.some((roomId) => this.seats.has(roomId))) {
+      for (const roomId of removed) {
+        this.seats.delete(roomId);
+        this.notifySeat(roomId);
+      }
+      this.order = this.order.filter((roomId) => this.seats.has(roomId));
+      this.notifyOrder();
+    }
+  }
+
+  subscribeSeat(roomId: string, listener: Listener) {
+    let listeners = this.seatListeners.get(roomId);
+    if (!listeners) {
+      listeners = new Set();
+      this.seatListeners.set(roomId, listeners);
+    }
+    listeners.add(listener);
+    return () => {
+      listeners!.delete(listener);
+      if (listeners!.size === 0) this.seatListeners.delete(roomId);
+    };
+  }
+
+  subscribeOrder(listener: Listener) {
+    this.orderListeners.add(listener);
+    return () => {
+      this.orderListeners.delete(listener);
+    };
+  }
+
+  private notifySeat(roomId: string) {
+    this.seatListeners.get(roomId)?.forEach((listener) => listener());
+  }
+
+  private notifyOrder() {
+    this.orderListeners.forEach((listener) => listener());
+  }
+}
+
+export function useSeat(store: SeatStore, roomId: string) {
+  const subscribe = useCallback((listener: Listener) => store.subscribeSeat(roomId, listener), [store, roomId]);
+  return useSyncExternalStore(subscribe, () => store.getSeat(roomId));
+}
+
+export function useSeatOrder(store: SeatStore) {
+  const subscribe = useCallback((listener: Listener) => store.subscribeOrder(listener), [store]);
+  return useSyncExternalStore(subscribe, store.getOrder);
+}
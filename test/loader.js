@@ -0,0 +1,33 @@
+import { readFile } from 'node:fs/promises';
+import ts from 'typescript';
+
+// Vite resolves extensionless imports; Node needs the .ts/.tsx spelled out
+export async function resolve(specifier, context, nextResolve) {
+  try {
+    return await nextResolve(specifier, context);
+  } catch (err) {
+    if (!specifier.startsWith('.')) throw err;
+    for (const extension of ['.ts', '.tsx']) {
+      try {
+        return await nextResolve(specifier + extension, context);
+      } catch {
+        // try the next extension
+      }
+    }
+    throw err;
+  }
+}
+
+// Types are stripped only, as Vite does; `npm run build` is what type-checks
+export async function load(url, context, nextLoad) {
+  if (!/\.tsx?$/.test(url)) return nextLoad(url, context);
+  const { outputText } = ts.transpileModule(await readFile(new URL(url), 'utf8'), {
+    fileName: url,
+    compilerOptions: {
+      module: ts.ModuleKind.ESNext,
+      target: ts.ScriptTarget.ES2020,
+      jsx: ts.JsxEmit.ReactJSX
+    }
+  });
+  return { format: 'module', source: outputText, shortCircuit: true };
+}
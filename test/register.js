@@ -0,0 +1,5 @@
+// `node --import ./test/register.js` lets Node run the TypeScript sources
+// (tests and the modules they import) by stripping their types, as Vite does
+import { register } from 'node:module';
+
+register('./loader.js', import.meta.url);